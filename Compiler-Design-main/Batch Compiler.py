@@ -0,0 +1,264 @@
+# Import the LL(1) table builder, regex/DFA conversions and Stats by file name
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from importlib import import_module
+predictive = import_module('Predictive Parsing Table')
+regex_nfa = import_module('Conversion from Regular Expression to NFA')
+nfa_dfa = import_module('Conversion from NFA to DFA')
+instrumentation = import_module('Performance Instrumentation')
+
+# --- Spec Format ---
+# One JSON object per spec, either
+#   {"id": "expr", "grammar": {"E": ["TR"], "R": ["+TR", "#"], ...}}
+#   {"id": "abc",  "regex": "ab|*c.", "alphabet": ["a", "b", "c"]}
+# "id" is optional and "alphabet" defaults to the operands of the regex.
+# Specs come from a JSON-lines manifest, or from a directory of *.json
+# (one spec or a list of specs per file) and *.jsonl manifests.
+
+REGEX_OPERATORS = {'*', '.', '|'}
+
+# --- Workers ---
+
+def compile_grammar(grammar):
+    stats = instrumentation.Stats()
+    first = predictive.compute_first(grammar)
+    follow = predictive.compute_follow(grammar, first)
+    table = predictive.build_parsing_table(grammar, first, follow, stats=stats)
+    return {
+        'first': {nt: sorted(first[nt]) for nt in grammar},
+        'follow': {nt: sorted(follow[nt]) for nt in grammar},
+        'table': {nt: dict(row) for nt, row in table.items()},
+        'conflicts': stats.counters['build_parsing_table.conflicts'],
+    }
+
+
+def check_postfix(postfix):
+    """
+    Raises ValueError unless the postfix regex leaves exactly one NFA on
+    the stack. regex_to_nfa returns the top of its stack, so "ab" (missing
+    its '.') would silently compile to an NFA for b alone.
+    """
+    depth = 0
+    for k, char in enumerate(postfix):
+        if char == '*':
+            needed = 1
+        elif char in ('.', '|'):
+            needed = 2
+        else:
+            depth += 1
+            continue
+        if depth < needed:
+            raise ValueError(f"malformed postfix regex {postfix!r}: "
+                             f"{char!r} at position {k} is missing an operand")
+        depth -= needed - 1
+    if depth != 1:
+        raise ValueError(f"malformed postfix regex {postfix!r}: "
+                         f"{depth} expressions left, expected 1")
+
+
+def compile_regex(postfix, alphabet=None):
+    check_postfix(postfix)
+    if alphabet is None:
+        alphabet = sorted(set(postfix) - REGEX_OPERATORS)
+    nfa = regex_nfa.regex_to_nfa(postfix)
+    transitions, start, accept = nfa_dfa.nfa_to_dfa(nfa, alphabet)
+    return {
+        'alphabet': list(alphabet),
+        'start': start,
+        'accept': sorted(accept),
+        'states': len(transitions),
+        # JSON object keys must be strings
+        'transitions': {str(s): row for s, row in transitions.items()},
+    }
+
+
+def compile_spec(spec):
+    """Compiles one spec. Never raises: errors are returned in the result."""
+    started = time.perf_counter()
+    result = {'id': spec.get('id'), 'ok': True}
+    try:
+        if 'grammar' in spec:
+            result['kind'] = 'grammar'
+            result.update(compile_grammar(spec['grammar']))
+        elif 'regex' in spec:
+            result['kind'] = 'regex'
+            result.update(compile_regex(spec['regex'], spec.get('alphabet')))
+        else:
+            raise ValueError("spec needs a 'grammar' or a 'regex' key")
+    except Exception as e:
+        result['ok'] = False
+        result['error'] = f"{type(e).__name__}: {e}"
+    result['seconds'] = time.perf_counter() - started
+    return result
+
+# --- Reading Specs ---
+
+def read_manifest(path):
+    """Yields specs from a JSON-lines file; bad lines become error specs."""
+    with open(path, encoding="utf-8") as f:
+        for line_num, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            default_id = f"{os.path.basename(path)}:{line_num}"
+            try:
+                spec = json.loads(line)
+            except json.JSONDecodeError as e:
+                yield {'id': default_id, 'invalid': f"JSONDecodeError: {e}"}
+                continue
+            if not isinstance(spec, dict):
+                yield {'id': default_id, 'invalid': "spec must be a JSON object"}
+                continue
+            spec.setdefault('id', default_id)
+            yield spec
+
+
+def read_specs(path):
+    if not os.path.isdir(path):
+        yield from read_manifest(path)
+        return
+    for name in sorted(os.listdir(path)):
+        full = os.path.join(path, name)
+        if name.endswith('.jsonl'):
+            yield from read_manifest(full)
+        elif name.endswith('.json'):
+            try:
+                with open(full, encoding="utf-8") as f:
+                    data = json.load(f)
+            except (OSError, json.JSONDecodeError) as e:
+                yield {'id': name, 'invalid': f"{type(e).__name__}: {e}"}
+                continue
+            specs = data if isinstance(data, list) else [data]
+            for k, spec in enumerate(specs):
+                if not isinstance(spec, dict):
+                    yield {'id': f"{name}[{k}]", 'invalid': "spec must be a JSON object"}
+                    continue
+                spec.setdefault('id', name[:-5] if len(specs) == 1 else f"{name}[{k}]")
+                yield spec
+
+# --- Main Logic ---
+
+def run_batch(specs, out, workers=None, max_in_flight=None):
+    """
+    Compiles specs on a process pool, writing one JSON line per result to
+    `out` as soon as it finishes (completion order, not input order).
+    At most `max_in_flight` specs are queued at once, so huge manifests
+    are streamed instead of loaded into memory. If a worker process dies,
+    the batch continues on a new pool and the specs that were in flight
+    are retried one at a time; only a spec that kills a worker again is
+    reported as failed.
+    Returns (total, failed).
+    """
+    total = failed = 0
+
+    def emit(result):
+        nonlocal total, failed
+        total += 1
+        failed += not result['ok']
+        out.write(json.dumps(result, ensure_ascii=False) + "\n")
+        out.flush()
+
+    # workers=0: compile in this process (handy for debugging)
+    if workers == 0:
+        for spec in specs:
+            emit(_invalid(spec) if 'invalid' in spec else compile_spec(spec))
+        return total, failed
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if max_in_flight is None:
+        max_in_flight = 4 * workers
+
+    pool = ProcessPoolExecutor(max_workers=workers)
+    pending = {}   # future -> spec
+    suspects = []  # specs that were in flight when a worker died
+
+    def drain(limit):
+        """Waits until at most `limit` specs are in flight, emitting results."""
+        while len(pending) > limit:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                spec = pending.pop(future)
+                try:
+                    emit(future.result())
+                except BrokenProcessPool:
+                    # Every spec in flight fails when one worker dies;
+                    # which one killed it is found by retry_suspects
+                    suspects.append(spec)
+                except Exception as e:
+                    emit({'id': spec.get('id'), 'ok': False, 'error': f"{type(e).__name__}: {e}"})
+
+    def retry_suspects():
+        """
+        Replaces the broken pool and reruns the specs that were in flight,
+        one at a time, so only a spec that kills a worker on its own is
+        reported as failed.
+        """
+        nonlocal pool
+        drain(0)
+        pool.shutdown()
+        pool = ProcessPoolExecutor(max_workers=workers)
+        for spec in suspects:
+            try:
+                emit(pool.submit(compile_spec, spec).result())
+            except BrokenProcessPool as e:
+                emit({'id': spec.get('id'), 'ok': False, 'error': f"BrokenProcessPool: {e}"})
+                pool.shutdown()
+                pool = ProcessPoolExecutor(max_workers=workers)
+        suspects.clear()
+
+    try:
+        for spec in specs:
+            if 'invalid' in spec:
+                emit(_invalid(spec))
+                continue
+            try:
+                future = pool.submit(compile_spec, spec)
+            except BrokenProcessPool:
+                retry_suspects()
+                future = pool.submit(compile_spec, spec)
+            pending[future] = spec
+            drain(max_in_flight - 1)
+            if suspects:
+                retry_suspects()
+        drain(0)
+        if suspects:
+            retry_suspects()
+    finally:
+        pool.shutdown()
+
+    return total, failed
+
+
+def _invalid(spec):
+    return {'id': spec['id'], 'ok': False, 'error': spec['invalid'], 'seconds': 0.0}
+
+# --- Main Execution ---
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Compile grammars into LL(1) tables and postfix regexes into DFAs in parallel.")
+    parser.add_argument("source", help="JSON-lines manifest, or a directory of *.json / *.jsonl specs")
+    parser.add_argument("-o", "--output", help="write JSON-lines results here (default: stdout)")
+    parser.add_argument("-j", "--workers", type=int, default=None,
+                        help="worker processes (default: CPU count, 0 = no pool)")
+    args = parser.parse_args()
+
+    out = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    start = time.perf_counter()
+    try:
+        total, failed = run_batch(read_specs(args.source), out, workers=args.workers)
+    finally:
+        if args.output:
+            out.close()
+    elapsed = time.perf_counter() - start
+
+    rate = total / elapsed if elapsed else 0.0
+    print(f"{total} specs ({total - failed} ok, {failed} failed) in {elapsed:.2f}s "
+          f"- {rate:,.1f} specs/s", file=sys.stderr)
+    sys.exit(1 if failed else 0)
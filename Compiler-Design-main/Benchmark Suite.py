@@ -0,0 +1,312 @@
+# Import every experiment through its file name
+import argparse
+import asyncio
+import json
+import math
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from importlib import import_module
+lexer = import_module('Implementation of Lexical Analyzer')
+regex_nfa = import_module('Conversion from Regular Expression to NFA')
+nfa_dfa = import_module('Conversion from NFA to DFA')
+first_follow = import_module('FIRST and FOLLOW Computation')
+leading_trailing = import_module('Computation of LEADING and TRAILING')
+transform = import_module('Elimination of Left Recursion & Left Factoring')
+predictive = import_module('Predictive Parsing Table')
+shift_reduce = import_module('Shift Reduce Parsing')
+streaming = import_module('Streaming Parser Pipeline')
+
+# --- Symbol Pools ---
+# Most experiments treat every character as a symbol and use isupper() to
+# spot non-terminals, so synthetic grammars draw single-character
+# non-terminals from all uppercase letters and terminals from CJK
+# ideographs (never uppercase, never an operator).
+NONTERMINALS = [c for c in map(chr, range(0x41, 0x3000)) if c.isupper() and len(c.lower()) == 1]
+TERMINALS = [chr(0x4E00 + k) for k in range(20000)]
+
+# --- Input Generators ---
+
+def random_source(n_statements, seed=0):
+    """Source text for tokenize: assignments and prints over random expressions."""
+    rng = random.Random(seed)
+    names = [f"v{k}" for k in range(50)]
+    lines = []
+    for _ in range(n_statements):
+        expr = [rng.choice(names)]
+        for _ in range(rng.randint(0, 6)):
+            expr.append(rng.choice('+-*/'))
+            expr.append(rng.choice(names) if rng.random() < 0.6 else str(rng.randint(0, 999)))
+        if rng.random() < 0.2:
+            lines.append(f"print ({' '.join(expr)});")
+        else:
+            lines.append(f"{rng.choice(names)} = {' '.join(expr)};")
+    return "\n".join(lines) + "\n"
+
+
+def nested_regex(depth):
+    """Postfix regex (((a|b)*|b)*|b)*...c nested `depth` times."""
+    postfix = "a"
+    for _ in range(depth):
+        postfix += "b|*"
+    return postfix + "c.", ['a', 'b', 'c']
+
+
+def wide_regex(width):
+    """Postfix regex (s1|s2|...|sw)*a over `width` distinct symbols."""
+    symbols = TERMINALS[:width]
+    postfix = symbols[0] + "".join(s + "|" for s in symbols[1:]) + "*a."
+    return postfix, symbols + ['a']
+
+
+def ll1_expression_grammar(levels):
+    """
+    LL(1) expression grammar with `levels` precedence levels:
+        A_k -> A_k+1 B_k        B_k -> op_k A_k+1 B_k | #
+        A_levels -> ( A_0 ) | i
+    """
+    A = NONTERMINALS[:levels + 1]
+    B = NONTERMINALS[levels + 1:2 * levels + 1]
+    ops = TERMINALS[:levels]
+    grammar = {}
+    for k in range(levels):
+        grammar[A[k]] = [A[k + 1] + B[k]]
+        grammar[B[k]] = [ops[k] + A[k + 1] + B[k], '#']
+    grammar[A[levels]] = ['(' + A[0] + ')', 'i']
+    return grammar
+
+
+def operator_grammar(levels):
+    """
+    Left-recursive operator grammar with `levels` precedence levels:
+        A_k -> A_k op_k A_k+1 | A_k+1        A_levels -> ( A_0 ) | i
+    """
+    A = NONTERMINALS[:levels + 1]
+    ops = TERMINALS[:levels]
+    grammar = {A[k]: [A[k] + ops[k] + A[k + 1], A[k + 1]] for k in range(levels)}
+    grammar[A[levels]] = ['(' + A[0] + ')', 'i']
+    return grammar
+
+
+def random_expression(n_operands, operators, seed=0):
+    """Token list for an expression over 'i', the given operators and parentheses."""
+    rng = random.Random(seed)
+    tokens = []
+    depth = 0
+    for k in range(n_operands):
+        if rng.random() < 0.1:
+            tokens.append('(')
+            depth += 1
+        tokens.append('i')
+        if depth and rng.random() < 0.1:
+            tokens.append(')')
+            depth -= 1
+        if k + 1 < n_operands:
+            tokens.append(rng.choice(operators))
+    tokens.extend(')' * depth)
+    return tokens
+
+# --- Benchmarks ---
+# name -> (sizes, quick sizes, setup(n) -> args, run(*args))
+
+def _first_follow(grammar):
+    first = first_follow.compute_first(grammar)
+    first_follow.compute_follow(grammar, first)
+
+
+def _ll1_table(grammar):
+    first = predictive.compute_first(grammar)
+    follow = predictive.compute_follow(grammar, first)
+    return predictive.build_parsing_table(grammar, first, follow)
+
+
+def _transform(grammar):
+    transform.left_factor(transform.remove_left_recursion(grammar, verbose=False), verbose=False)
+
+
+def _stream_parse(source, compiled, chunk_size=4096):
+    async def chunks():
+        for i in range(0, len(source), chunk_size):
+            yield source[i:i + chunk_size]
+
+    async def run():
+        return sum([result.ok async for result in streaming.parse_stream(chunks(), compiled)])
+
+    return asyncio.run(run())
+
+
+BENCHMARKS = {
+    'tokenize': (
+        [1_000, 4_000, 16_000, 64_000], [500, 2_000, 8_000],
+        lambda n: (random_source(n),),
+        lambda source: sum(1 for _ in lexer.tokenize(source))),
+    'regex_to_nfa/nested': (
+        [250, 1_000, 4_000, 16_000], [100, 400, 1_600],
+        lambda n: (nested_regex(n)[0],),
+        regex_nfa.regex_to_nfa),
+    'regex_to_nfa/wide': (
+        [250, 1_000, 4_000, 16_000], [100, 400, 1_600],
+        lambda n: (wide_regex(n)[0],),
+        regex_nfa.regex_to_nfa),
+    'nfa_to_dfa/nested': (
+        [25, 50, 100, 200], [10, 20, 40],
+        lambda n: (regex_nfa.regex_to_nfa(nested_regex(n)[0]), nested_regex(n)[1]),
+        nfa_dfa.nfa_to_dfa),
+    'nfa_to_dfa/wide': (
+        [25, 50, 100, 200], [10, 20, 40],
+        lambda n: (regex_nfa.regex_to_nfa(wide_regex(n)[0]), wide_regex(n)[1]),
+        nfa_dfa.nfa_to_dfa),
+    'first_follow': (
+        [20, 40, 80, 160], [10, 20, 40],
+        lambda n: (ll1_expression_grammar(n),),
+        _first_follow),
+    'leading_trailing/fixed_point': (
+        [20, 40, 80, 160], [10, 20, 40],
+        lambda n: (operator_grammar(n),),
+        lambda g: (leading_trailing.compute_leading(g), leading_trailing.compute_trailing(g))),
+    'leading_trailing/closure': (
+        [20, 40, 80, 160], [10, 20, 40],
+        lambda n: (operator_grammar(n),),
+        lambda g: (leading_trailing.compute_leading_closure(g), leading_trailing.compute_trailing_closure(g))),
+    'left_recursion+factoring': (
+        [2_000, 8_000, 32_000], [1_000, 4_000],
+        lambda n: (transform.synthetic_grammar(n, n_nonterminals=max(2, n // 100)),),
+        _transform),
+    'predictive_table': (
+        [20, 40, 80, 160], [10, 20, 40],
+        lambda n: (ll1_expression_grammar(n),),
+        _ll1_table),
+    'predictive_parse': (
+        [1_000, 4_000, 16_000, 64_000], [500, 2_000, 8_000],
+        lambda n: (random_expression(n, TERMINALS[:8]), _ll1_table(ll1_expression_grammar(8)), NONTERMINALS[0]),
+        predictive.predictive_parse),
+    'shift_reduce_parse': (
+        [2_000, 8_000, 32_000, 128_000], [1_000, 4_000, 16_000],
+        lambda n: ("".join(random_expression(n, '+*')).replace('i', 'id'),),
+        shift_reduce.shift_reduce_parser),
+    'stream_parse': (
+        [1_000, 4_000, 16_000, 64_000], [500, 2_000, 8_000],
+        lambda n: (random_source(n), streaming.CompiledGrammar()),
+        _stream_parse),
+}
+
+# --- Measurement ---
+
+def measure(setup, run, n, repeat):
+    args = setup(n)
+
+    # 1. Time: best of `repeat` runs, without tracemalloc overhead
+    best = math.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run(*args)
+        best = min(best, time.perf_counter() - start)
+
+    # 2. Peak memory: one separate traced run
+    tracemalloc.start()
+    run(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak
+
+
+def growth_exponent(sizes, seconds):
+    """Least-squares slope of log(time) vs log(n): ~1 linear, ~2 quadratic."""
+    points = [(math.log(n), math.log(t)) for n, t in zip(sizes, seconds) if t > 0]
+    if len(points) < 2:
+        return None
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    var = sum((x - mean_x) ** 2 for x, _ in points)
+    if not var:
+        return None
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / var
+
+
+def run_suite(names, quick=False, repeat=3):
+    results = {}
+    print(f"{'Benchmark':<30} {'n':>8} {'Time (ms)':>12} {'Peak (KB)':>12}")
+    print("-" * 65)
+    for name in names:
+        sizes, quick_sizes, setup, run = BENCHMARKS[name]
+        if quick:
+            sizes = quick_sizes
+        seconds, peaks = [], []
+        for n in sizes:
+            t, peak = measure(setup, run, n, repeat)
+            seconds.append(t)
+            peaks.append(peak)
+            print(f"{name:<30} {n:>8} {t * 1000:>12.2f} {peak / 1024:>12.1f}")
+        exponent = growth_exponent(sizes, seconds)
+        if exponent is not None:
+            print(f"{'':<30} {'trend':>8} {'O(n^' + format(exponent, '.2f') + ')':>12}")
+        results[name] = {'sizes': sizes, 'seconds': seconds, 'peak_bytes': peaks, 'exponent': exponent}
+    return results
+
+# --- Baselines ---
+
+def save_baseline(path, results, label):
+    baseline = {
+        'label': label,
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'benchmarks': results,
+    }
+    with open(path, "w") as f:
+        json.dump(baseline, f, indent=2)
+
+
+def compare_baseline(path, results, threshold):
+    """Prints time ratios against a saved baseline; returns the regressions."""
+    with open(path) as f:
+        baseline = json.load(f)
+    print(f"\nComparing against '{baseline.get('label')}' ({baseline.get('created')})")
+    print(f"{'Benchmark':<30} {'n':>8} {'Old (ms)':>10} {'New (ms)':>10} {'Ratio':>8}")
+    print("-" * 70)
+
+    regressions = []
+    for name, new in results.items():
+        old = baseline['benchmarks'].get(name)
+        if old is None:
+            continue
+        old_times = dict(zip(old['sizes'], old['seconds']))
+        for n, t in zip(new['sizes'], new['seconds']):
+            if n not in old_times:
+                continue
+            ratio = t / old_times[n]
+            flag = "  SLOWER" if ratio > threshold else ""
+            print(f"{name:<30} {n:>8} {old_times[n] * 1000:>10.2f} {t * 1000:>10.2f} {ratio:>8.2f}{flag}")
+            if ratio > threshold:
+                regressions.append((name, n, ratio))
+    return regressions
+
+# --- Main Execution ---
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the compiler design experiments.")
+    parser.add_argument("--quick", action="store_true", help="smaller sizes for a fast run")
+    parser.add_argument("--only", default="", help="run benchmarks whose name contains this text")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per size (best is kept)")
+    parser.add_argument("--save", metavar="JSON", help="write results as a baseline file")
+    parser.add_argument("--label", default="", help="label stored in the baseline (e.g. a version)")
+    parser.add_argument("--compare", metavar="JSON", help="compare results with a baseline file")
+    parser.add_argument("--threshold", type=float, default=1.25,
+                        help="time ratio above which a result counts as a regression")
+    args = parser.parse_args()
+
+    names = [name for name in BENCHMARKS if args.only in name]
+    results = run_suite(names, quick=args.quick, repeat=args.repeat)
+
+    if args.save:
+        save_baseline(args.save, results, args.label)
+        print(f"\nBaseline written to {args.save}")
+
+    if args.compare:
+        regressions = compare_baseline(args.compare, results, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} result(s) slower than {args.threshold}x the baseline")
+            sys.exit(1)
@@ -1,4 +1,10 @@
 from collections import defaultdict
+# Import the shared symbol splitter from the Left Recursion & Left Factoring file
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from importlib import import_module
+split_symbols = import_module('Elimination of Left Recursion & Left Factoring').split_symbols
 
 
 grammar = {
@@ -8,16 +14,29 @@ grammar = {
 }
 
 
-def compute_leading(grammar):
+def _is_nonterminal(symbol, nonterminals):
+    return symbol in nonterminals or symbol.isupper()
+
+
+def compute_leading(grammar, terminals=(), stats=None):
+    if stats is not None:
+        started = stats.clock()
     leading = defaultdict(set)
+    passes = 0
+    nonterminals = set(grammar)
+    split = {nt: [split_symbols(p, nonterminals, terminals=terminals) for p in prods]
+             for nt, prods in grammar.items()}
     
     while True:
         updated = False
+        passes += 1
         
-        for nt, prods in grammar.items():
+        for nt, prods in split.items():
             for prod in prods:
+                if not prod:
+                    continue  # ε-production: no terminals
                 # Rule 1: A -> a... (Terminal at start)
-                if not prod[0].isupper():
+                if not _is_nonterminal(prod[0], nonterminals):
                     if prod[0] not in leading[nt]:
                         leading[nt].add(prod[0])
                         updated = True
@@ -30,27 +49,41 @@ def compute_leading(grammar):
                         updated = True
                     
                     # Rule 3: A -> B a... (Terminal after first NT)
-                    if len(prod) > 1 and not prod[1].isupper():
+                    if len(prod) > 1 and not _is_nonterminal(prod[1], nonterminals):
                         if prod[1] not in leading[nt]:
                             leading[nt].add(prod[1])
                             updated = True
                             
+        if stats is not None:
+            stats.event('compute_leading.pass', number=passes, updated=updated)
         if not updated:
             break
-            
+
+    if stats is not None:
+        stats.add('compute_leading.passes', passes)
+        stats.add_time('compute_leading', started)
     return leading
 
 
-def compute_trailing(grammar):
+def compute_trailing(grammar, terminals=(), stats=None):
+    if stats is not None:
+        started = stats.clock()
     trailing = defaultdict(set)
+    passes = 0
+    nonterminals = set(grammar)
+    split = {nt: [split_symbols(p, nonterminals, terminals=terminals) for p in prods]
+             for nt, prods in grammar.items()}
     
     while True:
         updated = False
+        passes += 1
         
-        for nt, prods in grammar.items():
+        for nt, prods in split.items():
             for prod in prods:
+                if not prod:
+                    continue  # ε-production: no terminals
                 # Rule 1: A -> ...a (Terminal at end)
-                if not prod[-1].isupper():
+                if not _is_nonterminal(prod[-1], nonterminals):
                     if prod[-1] not in trailing[nt]:
                         trailing[nt].add(prod[-1])
                         updated = True
@@ -63,16 +96,330 @@ def compute_trailing(grammar):
                         updated = True
                         
                     # Rule 3: A -> ...a B (Terminal before last NT)
-                    if len(prod) > 1 and not prod[-2].isupper():
+                    if len(prod) > 1 and not _is_nonterminal(prod[-2], nonterminals):
                         if prod[-2] not in trailing[nt]:
                             trailing[nt].add(prod[-2])
                             updated = True
 
+        if stats is not None:
+            stats.event('compute_trailing.pass', number=passes, updated=updated)
         if not updated:
             break
-            
+
+    if stats is not None:
+        stats.add('compute_trailing.passes', passes)
+        stats.add_time('compute_trailing', started)
     return trailing
 
+
+# --- Transitive-Closure Engine (Bit Matrices) ---
+# Each non-terminal gets a row bitmask: bits [0, n) mark the non-terminals
+# it reaches directly, bits [n, n + m) mark the terminals it reaches
+# directly. Warshall's algorithm over the non-terminal columns then leaves
+# LEADING (or TRAILING) in the terminal bits of every row.
+
+def _closure_sets(grammar, from_end, terminals=(), stats=None):
+    if stats is not None:
+        started = stats.clock()
+    name = 'compute_trailing_closure' if from_end else 'compute_leading_closure'
+    nonterminals = set(grammar)
+    split = {nt: [split_symbols(p, nonterminals, terminals=terminals) for p in prods]
+             for nt, prods in grammar.items()}
+
+    # Number every non-terminal (including undeclared ones) and terminal
+    nt_index = {nt: i for i, nt in enumerate(grammar)}
+    t_index = {}
+    for prods in split.values():
+        for symbols in prods:
+            for sym in symbols:
+                if _is_nonterminal(sym, nonterminals):
+                    nt_index.setdefault(sym, len(nt_index))
+    n = len(nt_index)
+    for prods in split.values():
+        for symbols in prods:
+            for sym in symbols:
+                if not _is_nonterminal(sym, nonterminals):
+                    t_index.setdefault(sym, n + len(t_index))
+
+    # 1. Direct relations
+    rows = [0] * n
+    for nt, prods in split.items():
+        row = 0
+        for symbols in prods:
+            if not symbols:
+                continue
+            if from_end:
+                symbols = symbols[::-1]
+            X = symbols[0]
+            if X in t_index:
+                # A -> a...  (or A -> ...a)
+                row |= 1 << t_index[X]
+            else:
+                # A -> B...  (or A -> ...B)
+                row |= 1 << nt_index[X]
+                # A -> B a... (or A -> ...a B)
+                if len(symbols) > 1 and symbols[1] in t_index:
+                    row |= 1 << t_index[symbols[1]]
+        rows[nt_index[nt]] = row
+
+    # 2. Warshall closure over the non-terminal columns
+    row_unions = 0
+    for k in range(n):
+        bit = 1 << k
+        row_k = rows[k]
+        if not row_k:
+            continue
+        for i in range(n):
+            if rows[i] & bit:
+                rows[i] |= row_k
+                row_unions += 1
+
+    # 3. Decode terminal bits back into sets
+    symbol_at_bit = [None] * (n + len(t_index))
+    for t, idx in t_index.items():
+        symbol_at_bit[idx] = t
+
+    result = defaultdict(set)
+    for nt, i in nt_index.items():
+        mask = rows[i] >> n << n
+        found = result[nt]
+        while mask:
+            low = mask & -mask
+            found.add(symbol_at_bit[low.bit_length() - 1])
+            mask ^= low
+
+    if stats is not None:
+        stats.add(f'{name}.row_unions', row_unions)
+        stats.add_time(name, started)
+    return result
+
+
+def compute_leading_closure(grammar, terminals=(), stats=None):
+    """LEADING sets via bit-matrix transitive closure (one pass, no fixed-point)."""
+    return _closure_sets(grammar, from_end=False, terminals=terminals, stats=stats)
+
+
+def compute_trailing_closure(grammar, terminals=(), stats=None):
+    """TRAILING sets via bit-matrix transitive closure (one pass, no fixed-point)."""
+    return _closure_sets(grammar, from_end=True, terminals=terminals, stats=stats)
+
+
+# --- Operator Precedence Relations ---
+# Relations are stored as table[a][b] with:
+#   '<'  a yields precedence to b   (a ⋖ b)
+#   '='  a has equal precedence     (a ≐ b)
+#   '>'  a takes precedence over b  (a ⋗ b)
+
+def build_precedence_table(grammar, leading, trailing, start_symbol=None, terminals=()):
+    """
+    Builds the operator precedence relation matrix from LEADING/TRAILING.
+    Pass the same `terminals` (multi-character terminals such as 'id') as
+    to compute_leading/compute_trailing.
+    Returns:
+      - table: dict { a: { b: relation } }
+      - conflicts: list of (a, b, existing_relation, new_relation)
+    """
+    if start_symbol is None:
+        start_symbol = next(iter(grammar))
+
+    nonterminals = set(grammar)
+    table = defaultdict(dict)
+    conflicts = []
+
+    def add_relation(a, b, rel):
+        existing = table[a].get(b)
+        if existing is None:
+            table[a][b] = rel
+        elif existing != rel:
+            conflicts.append((a, b, existing, rel))
+
+    for nt, prods in grammar.items():
+        for prod in prods:
+            prod = split_symbols(prod, nonterminals, terminals=terminals)
+            for i in range(len(prod) - 1):
+                x, y = prod[i], prod[i + 1]
+                x_term = not _is_nonterminal(x, nonterminals)
+                y_term = not _is_nonterminal(y, nonterminals)
+
+                # Rule 1: A -> ...ab...  gives a ≐ b
+                if x_term and y_term:
+                    add_relation(x, y, '=')
+
+                # Rule 2: A -> ...aBb... gives a ≐ b
+                if x_term and not y_term and i + 2 < len(prod):
+                    z = prod[i + 2]
+                    if not _is_nonterminal(z, nonterminals):
+                        add_relation(x, z, '=')
+
+                # Rule 3: A -> ...aB...  gives a ⋖ LEADING(B)
+                if x_term and not y_term:
+                    for b in leading[y]:
+                        add_relation(x, b, '<')
+
+                # Rule 4: A -> ...Bb...  gives TRAILING(B) ⋗ b
+                if not x_term and y_term:
+                    for a in trailing[x]:
+                        add_relation(a, y, '>')
+
+    # End marker: $ ⋖ LEADING(S) and TRAILING(S) ⋗ $
+    for b in leading[start_symbol]:
+        add_relation('$', b, '<')
+    for a in trailing[start_symbol]:
+        add_relation(a, '$', '>')
+
+    return table, conflicts
+
+
+def build_precedence_functions(table, conflicts):
+    """
+    Derives precedence functions f and g such that
+      a ⋖ b => f(a) < g(b),  a ≐ b => f(a) = g(b),  a ⋗ b => f(a) > g(b).
+    Uses the graph method: ≐ merges nodes f_a and g_b, ⋗ adds f_a -> g_b,
+    ⋖ adds g_b -> f_a, and each function value is the longest path from
+    its node. `conflicts` is the list from build_precedence_table: a table
+    with conflicts is not an operator precedence table, so no functions
+    are built. Returns (f, g), or None if there are conflicts or the graph
+    has a cycle.
+    """
+    if conflicts:
+        return None
+
+    terminals = set(table)
+    for row in table.values():
+        terminals.update(row)
+
+    # Union-Find over the nodes ('f', a) and ('g', b) for the ≐ relation
+    parent = {}
+    for t in terminals:
+        parent[('f', t)] = ('f', t)
+        parent[('g', t)] = ('g', t)
+
+    def find(node):
+        root = node
+        while parent[root] != root:
+            root = parent[root]
+        while parent[node] != root:
+            parent[node], node = root, parent[node]
+        return root
+
+    for a, row in table.items():
+        for b, rel in row.items():
+            if rel == '=':
+                parent[find(('f', a))] = find(('g', b))
+
+    # Edges between groups: an edge u -> v means value(u) > value(v)
+    edges = defaultdict(set)
+    for a, row in table.items():
+        for b, rel in row.items():
+            if rel == '>':
+                edges[find(('f', a))].add(find(('g', b)))
+            elif rel == '<':
+                edges[find(('g', b))].add(find(('f', a)))
+
+    groups = {find(node) for node in parent}
+    for u, targets in edges.items():
+        if u in targets:
+            return None  # a ⋖ b and a ≐ b collapse into a self-loop
+
+    # Longest path via reverse topological order (Kahn's algorithm)
+    indegree = {u: 0 for u in groups}
+    for targets in edges.values():
+        for v in targets:
+            indegree[v] += 1
+
+    order = [u for u in groups if indegree[u] == 0]
+    for u in order:
+        for v in edges[u]:
+            indegree[v] -= 1
+            if indegree[v] == 0:
+                order.append(v)
+
+    if len(order) != len(groups):
+        return None  # Cycle: no precedence functions exist
+
+    value = {}
+    for u in reversed(order):
+        value[u] = max((value[v] + 1 for v in edges[u]), default=0)
+
+    f = {t: value[find(('f', t))] for t in terminals}
+    g = {t: value[find(('g', t))] for t in terminals}
+    return f, g
+
+
+def handle_shapes(grammar, terminals=()):
+    """
+    Right-hand sides as the operator precedence parser sees them: every
+    non-terminal becomes None, since the parser cannot tell them apart.
+    Single non-terminal (unit) productions never form a handle.
+    """
+    nonterminals = set(grammar)
+    shapes = set()
+    for prods in grammar.values():
+        for prod in prods:
+            shape = tuple(None if _is_nonterminal(sym, nonterminals) else sym
+                          for sym in split_symbols(prod, nonterminals, terminals=terminals))
+            if shape != (None,):
+                shapes.add(shape)
+    return shapes
+
+
+def operator_precedence_parse(tokens, grammar, table, f, g, terminals=()):
+    """
+    Stack-based operator precedence parser driven by precedence functions.
+    Non-terminals are kept on the stack as None (they are interchangeable).
+    f and g decide between shift and reduce, but they also give an answer
+    for blank (error) entries of the relation table, so every pair of
+    terminals is first checked against `table`, and every handle against
+    the right-hand sides of `grammar`.
+    Returns the list of reduced handles (as tuples of terminals), or
+    raises RuntimeError on invalid input.
+    """
+    nonterminals = set(grammar)
+    shapes = handle_shapes(grammar, terminals)
+    stack = ['$']
+    handles = []
+    buffer = list(split_symbols(tokens, nonterminals, terminals=terminals)) + ['$']
+    pos = 0
+
+    def compare(a, b):
+        """f(a) - g(b): < 0 for ⋖, 0 for ≐, > 0 for ⋗."""
+        if table.get(a, {}).get(b) is None:
+            raise RuntimeError(f'{b!r} unexpected after {a!r} at position {pos}')
+        return f[a] - g[b]
+
+    while True:
+        top = stack[-1] if stack[-1] is not None else stack[-2]
+        a = buffer[pos]
+
+        if top == '$' and a == '$':
+            if stack != ['$', None]:
+                raise RuntimeError(f'unexpected end of input at position {pos}')
+            return handles
+
+        if compare(top, a) <= 0:
+            # Shift (⋖ or ≐); '$' is never shifted
+            if a == '$':
+                raise RuntimeError(f'unexpected end of input at position {pos}')
+            stack.append(a)
+            pos += 1
+        else:
+            # Reduce (⋗): pop until the terminal below ⋖ the last popped one
+            handle = []
+            if stack[-1] is None:
+                handle.append(stack.pop())
+            while True:
+                popped = stack.pop()
+                handle.append(popped)
+                if stack[-1] is None:
+                    handle.append(stack.pop())
+                if compare(stack[-1], popped) < 0:
+                    break
+            handle.reverse()
+            if tuple(handle) not in shapes:
+                raise RuntimeError(f'no production matches handle at position {pos}')
+            handles.append(tuple(sym for sym in handle if sym is not None))
+            stack.append(None)
+
 if __name__ == "__main__":
     print(f"Grammar: {grammar}\n")
     
@@ -88,3 +435,46 @@ if __name__ == "__main__":
         l_set = str(leading_sets[nt])
         t_set = str(trailing_sets[nt])
         print(f"{nt:<15} {l_set:<20} {t_set}")
+
+    # Cross-check against the bit-matrix closure engine
+    same = (all(compute_leading_closure(grammar)[nt] == leading_sets[nt] for nt in grammar) and
+            all(compute_trailing_closure(grammar)[nt] == trailing_sets[nt] for nt in grammar))
+    print(f"\nClosure engine agrees with fixed-point iteration: {same}")
+
+    # --- Operator Precedence Table ---
+    table, conflicts = build_precedence_table(grammar, leading_sets, trailing_sets)
+    terminals = sorted(set(table) | {b for row in table.values() for b in row})
+    symbols = {'<': '⋖', '=': '≐', '>': '⋗'}
+
+    print(f"\n{'OPERATOR PRECEDENCE TABLE':^60}")
+    print("-" * 60)
+    print(f"{'':<5}" + "".join(f"{t:<5}" for t in terminals))
+    for a in terminals:
+        row = "".join(f"{symbols.get(table[a].get(b), ''):<5}" for b in terminals)
+        print(f"{a:<5}{row}")
+
+    if conflicts:
+        print(f"\nConflicts: {conflicts}")
+
+    # --- Precedence Functions ---
+    functions = build_precedence_functions(table, conflicts)
+    if functions is None:
+        print("\nNo precedence functions exist for this grammar.")
+    else:
+        f, g = functions
+        print(f"\n{'':<5}" + "".join(f"{t:<5}" for t in terminals))
+        print(f"{'f':<5}" + "".join(f"{f[t]:<5}" for t in terminals))
+        print(f"{'g':<5}" + "".join(f"{g[t]:<5}" for t in terminals))
+
+        user_input = "i+i*i"
+        print(f"\nParsing Input: {user_input}")
+        for handle in operator_precedence_parse(user_input, grammar, table, f, g):
+            print(f"  Reduce {''.join(handle)}")
+
+        # Invalid inputs are rejected
+        for bad_input in ["ii", "+", "i+", "i)", "(i", "i+*i"]:
+            try:
+                operator_precedence_parse(bad_input, grammar, table, f, g)
+                print(f"{bad_input!r}: accepted")
+            except RuntimeError as e:
+                print(f"{bad_input!r}: {e}")
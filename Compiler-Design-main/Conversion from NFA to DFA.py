@@ -1,4 +1,4 @@
-# Import the State, NFA classes and nfa_result from the Regular Expression to NFA file
+# Import the State, NFA classes and regex_to_nfa from the Regular Expression to NFA file
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
@@ -6,8 +6,8 @@ from importlib import import_module
 regex_nfa_module = import_module('Conversion from Regular Expression to NFA')
 State = regex_nfa_module.State
 NFA = regex_nfa_module.NFA
-nfa_result = regex_nfa_module.nfa_result
 regex_to_nfa = regex_nfa_module.regex_to_nfa
+sinks_module = import_module('Trace Sinks')
 
 def get_epsilon_closure(nfa_states):
     """
@@ -37,16 +37,24 @@ def move(nfa_states, symbol):
                 reachable.add(next_state)
     return reachable
 
-def nfa_to_dfa(nfa, alphabet):
+def nfa_to_dfa(nfa, alphabet, stats=None, trace=None):
     """
     Converts an NFA to a DFA using Subset Construction.
     Returns: 
       - dfa_transitions: dict { dfa_state_id : { char: next_dfa_state_id } }
       - dfa_start_state: ID of the start state
       - dfa_accept_states: Set of IDs of accept states
+    If a stats object is given, records closure calls, moves, DFA states,
+    transitions and the NFA states held by all DFA states.
+    If a trace sink is given, emits one record per transition:
+      {'state', 'accept', 'symbol', 'target', 'new'}
     """
+    if stats is not None:
+        started = stats.clock()
+
     # 1. Start State = Epsilon Closure of NFA start
     start_closure = get_epsilon_closure({nfa.start})
+    closure_calls = 1
     
     # We need to map these sets of NFA states to simple IDs (0, 1, 2...)
     states_map = {start_closure: 0} # { frozenset(nfa_states) : dfa_id }
@@ -56,6 +64,7 @@ def nfa_to_dfa(nfa, alphabet):
     dfa_accept_states = set()
     
     state_counter = 0
+    subset_sizes = len(start_closure)  # NFA states held by all DFA states
 
     while unmarked_states:
         # Get current DFA state (which is a set of NFA states)
@@ -78,46 +87,53 @@ def nfa_to_dfa(nfa, alphabet):
                 
             # 3. Calculate Epsilon Closure of the result
             closure = get_epsilon_closure(moved_states)
+            closure_calls += 1
             
             # 4. Check if we've seen this new state before
-            if closure not in states_map:
+            is_new = closure not in states_map
+            if is_new:
                 state_counter += 1
                 states_map[closure] = state_counter
                 unmarked_states.append(closure)
+                subset_sizes += len(closure)
+                if stats is not None:
+                    stats.event('nfa_to_dfa.state', id=state_counter, nfa_states=len(closure))
             
             # Record transition
             target_id = states_map[closure]
             dfa_transitions[current_id][symbol] = target_id
+            if trace is not None:
+                trace.emit({'state': current_id, 'accept': current_id in dfa_accept_states,
+                            'symbol': symbol, 'target': target_id, 'new': is_new})
 
+    if stats is not None:
+        stats.add('nfa_to_dfa.closure_calls', closure_calls)
+        stats.add('nfa_to_dfa.move_calls', len(dfa_transitions) * len(alphabet))
+        stats.add('nfa_to_dfa.dfa_states', len(dfa_transitions))
+        stats.add('nfa_to_dfa.transitions', sum(len(t) for t in dfa_transitions.values()))
+        stats.add('nfa_to_dfa.subset_size_total', subset_sizes)
+        stats.add_time('nfa_to_dfa', started)
+    if trace is not None:
+        trace.flush()
     return dfa_transitions, 0, dfa_accept_states
 
 # --- Testing the Conversion ---
-
-# Option A: Use the imported nfa_result from the regex file
-# Option B: Create a new NFA here if the import fails
-try:
-    # Try to use the imported nfa_result
-    test_nfa = nfa_result
-    print("Using NFA from 'Conversion from Regular Expression to NFA.py'")
-except NameError:
-    # If nfa_result is not available, create a new one
-    print("Creating a new NFA for testing: (a|b)*c")
+if __name__ == "__main__":
+    # Build the NFA with the Regular Expression to NFA file
+    print("Creating NFA for: (a|b)*c")
     postfix_regex = "ab|*c."
     test_nfa = regex_to_nfa(postfix_regex)
 
-# Define the alphabet used in the regex
-alphabet = ['a', 'b', 'c']
+    # Define the alphabet used in the regex
+    alphabet = ['a', 'b', 'c']
 
-print("\nConverting NFA to DFA...")
-print("-" * 30)
+    print("\nConverting NFA to DFA...")
+    print("-" * 30)
 
-transitions, start_id, accept_ids = nfa_to_dfa(test_nfa, alphabet)
+    # Trace the subset construction as it discovers transitions
+    trace = sinks_module.TableSink([('state', 'State', 7), ('symbol', 'Symbol', 8),
+                                    ('target', 'Target', 8), ('new', 'New State', 0)])
+    transitions, start_id, accept_ids = nfa_to_dfa(test_nfa, alphabet, trace=trace)
 
-print(f"Start State: {start_id}")
-print(f"Accept States: {accept_ids}")
-print("Transitions:")
-for state_id, trans in transitions.items():
-    state_label = " (ACCEPT)" if state_id in accept_ids else ""
-    print(f"  State {state_id}{state_label}:")
-    for char, next_id in trans.items():
-        print(f"    --[{char}]--> State {next_id}")
\ No newline at end of file
+    print(f"\nStart State: {start_id}")
+    print(f"Accept States: {accept_ids}")
@@ -1,3 +1,5 @@
+import sys
+
 class State:
     def __init__(self, label=None):
         self.label = label
@@ -68,7 +70,9 @@ def star(nfa):
 
 # --- Main Logic ---
 
-def regex_to_nfa(postfix_exp):
+def regex_to_nfa(postfix_exp, stats=None):
+    if stats is not None:
+        started = stats.clock()
     stack = []
     
     for char in postfix_exp:
@@ -89,38 +93,62 @@ def regex_to_nfa(postfix_exp):
         else:
             # Operand (character)
             stack.append(from_symbol(char))
-            
+
+    if stats is not None:
+        # Every operand, union and star creates 2 states; concat creates none
+        concats = postfix_exp.count('.')
+        stats.add('regex_to_nfa.symbols', len(postfix_exp))
+        stats.add('regex_to_nfa.states', 2 * (len(postfix_exp) - concats))
+        stats.add_time('regex_to_nfa', started)
     return stack.pop()
 
 # --- Helper to Visualize ---
 
+def number_states(nfa):
+    """Numbers the states reachable from nfa.start in depth-first order (no recursion)."""
+    numbers = {}
+    stack = [nfa.start]
+    while stack:
+        state = stack.pop()
+        if state in numbers:
+            continue
+        numbers[state] = len(numbers)
+        for neighbors in reversed(list(state.edges.values())):
+            stack.extend(n for n in reversed(neighbors) if n not in numbers)
+    return numbers
+
+def trace_nfa(nfa, trace):
+    """Emits one record {'state', 'accept', 'symbol', 'target'} per edge to a trace sink."""
+    numbers = number_states(nfa)
+    for state, state_id in numbers.items():
+        for char, neighbors in state.edges.items():
+            char_label = char if char is not None else "ε"
+            for n in neighbors:
+                trace.emit({'state': state_id, 'accept': state is nfa.end,
+                            'symbol': char_label, 'target': numbers[n]})
+    trace.flush()
+
 def print_nfa(nfa):
-    visited = set()
-    
-    def traverse(state):
-        if state in visited:
-            return
-        visited.add(state)
-        state_id = id(state) % 1000 # Shorten ID for readability
-        
+    lines = []
+    numbers = number_states(nfa)
+    for state, state_id in numbers.items():
         # Check if this is the end state
-        label = " (ACCEPT)" if state == nfa.end else ""
-        print(f"State {state_id}{label}:")
-        
+        label = " (ACCEPT)" if state is nfa.end else ""
+        lines.append(f"State {state_id}{label}:")
         for char, neighbors in state.edges.items():
             char_label = char if char is not None else "ε"
             for n in neighbors:
-                print(f"  --[{char_label}]--> State {id(n) % 1000}")
-                traverse(n)
-
-    traverse(nfa.start)
+                lines.append(f"  --[{char_label}]--> State {numbers[n]}")
+    # One write for the whole NFA instead of one print per edge
+    sys.stdout.write("\n".join(lines) + "\n")
 
 # --- Test ---
-# Regex: (a|b)*c
-# Postfix: ab|*c. (Note: we use '.' for explicit concatenation)
-postfix_regex = "ab|*c." 
-
-print(f"Converting Postfix Regex: {postfix_regex}")
-print("-" * 30)
-nfa_result = regex_to_nfa(postfix_regex)
-print_nfa(nfa_result)
\ No newline at end of file
+if __name__ == "__main__":
+    # Regex: (a|b)*c
+    # Postfix: ab|*c. (Note: we use '.' for explicit concatenation)
+    postfix_regex = "ab|*c."
+
+    print(f"Converting Postfix Regex: {postfix_regex}")
+    print("-" * 30)
+    nfa_result = regex_to_nfa(postfix_regex)
+    print_nfa(nfa_result)
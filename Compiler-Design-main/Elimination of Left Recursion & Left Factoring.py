@@ -1,83 +1,260 @@
+import random
+import sys
+import time
+
+EPSILON = 'ε'
+
+# --- Helper Functions ---
+
+def split_symbols(prod, nonterminals, max_len=None, terminals=()):
+    """
+    Splits a production string into grammar symbols.
+    Non-terminals, and any multi-character terminals declared in
+    `terminals` (e.g. {'id'}), are matched by name, longest first (so E'
+    wins over E); every other character is a terminal. 'ε' is the empty
+    production. Lists/tuples are taken as already split.
+    Shared with the LEADING/TRAILING, grammar optimization and
+    shift-reduce experiments, so every one of them splits symbols alike.
+    """
+    if not isinstance(prod, str):
+        return tuple(prod)
+    if prod == EPSILON:
+        return ()
+    if max_len is None:
+        max_len = max(map(len, [*nonterminals, *terminals]), default=1)
+
+    symbols = []
+    i = 0
+    while i < len(prod):
+        for k in range(min(max_len, len(prod) - i), 1, -1):
+            if prod[i:i + k] in nonterminals or prod[i:i + k] in terminals:
+                symbols.append(prod[i:i + k])
+                i += k
+                break
+        else:
+            symbols.append(prod[i])
+            i += 1
+    return tuple(symbols)
+
+
+def join_symbols(symbols):
+    return ''.join(symbols) if symbols else EPSILON
+
+
+def fresh_name(nt, taken):
+    """Returns nt', nt'', ... whichever is not already used in the grammar."""
+    name = nt + "'"
+    while name in taken:
+        name += "'"
+    taken.add(name)
+    return name
+
+
 # --- Left Recursion Elimination ---
-def remove_left_recursion(grammar):
-    print("\n--- Removing Left Recursion ---")
-    new_grammar = {}
-    
-    for nt, prods in grammar.items():
-        recursive = []
-        non_recursive = []
-        
-        for p in prods:
-            if p.startswith(nt): recursive.append(p[len(nt):])
-            else: non_recursive.append(p)
-            
+def remove_left_recursion(grammar, verbose=True, stats=None):
+    """
+    Removes direct and indirect left recursion (ordered substitution).
+    Non-terminals are ordered A1..An as they appear in the grammar. For each
+    Ai, every production Ai -> Aj γ with j < i is expanded with the final
+    productions of Aj, then direct recursion in Ai is removed:
+        A -> Aα | β   becomes   A -> βA',  A' -> αA' | ε
+    Like the textbook algorithm, the result is only guaranteed for grammars
+    without cycles (A =>+ A) and ε-productions.
+    """
+    if verbose:
+        print("\n--- Removing Left Recursion ---")
+    if stats is not None:
+        started = stats.clock()
+    substitutions = 0
+    nonterminals = set(grammar)
+    max_len = max(map(len, nonterminals), default=1)
+    order = {nt: i for i, nt in enumerate(grammar)}
+    taken = set(grammar)
+
+    rules = {nt: [split_symbols(p, nonterminals, max_len) for p in prods]
+             for nt, prods in grammar.items()}
+    primes = {}
+
+    for nt in grammar:
+        i = order[nt]
+
+        # Substitute earlier non-terminals at the front. Each expansion
+        # strictly raises the order of the leading symbol, so this ends.
+        expanded = []
+        stack = rules[nt][::-1]
+        while stack:
+            prod = stack.pop()
+            head = prod[0] if prod else None
+            if head in order and order[head] < i:
+                rest = prod[1:]
+                stack.extend([beta + rest for beta in reversed(rules[head])])
+                substitutions += 1
+            else:
+                expanded.append(prod)
+
+        recursive = [p[1:] for p in expanded if p and p[0] == nt]
         if not recursive:
-            new_grammar[nt] = prods
+            rules[nt] = expanded
             continue
-            
-        print(f"Recursion found in {nt}")
-        new_nt = nt + "'"
-        
+
+        non_recursive = [p for p in expanded if not p or p[0] != nt]
+        if verbose:
+            print(f"Recursion found in {nt}")
+        new_nt = fresh_name(nt, taken)
+        primes[nt] = new_nt
+
         # Rule 1: A -> beta A'
-        new_grammar[nt] = [beta + new_nt for beta in non_recursive]
+        rules[nt] = [beta + (new_nt,) for beta in non_recursive]
         # Rule 2: A' -> alpha A' | ε
-        new_grammar[new_nt] = [alpha + new_nt for alpha in recursive] + ['ε']
-        
+        rules[new_nt] = [alpha + (new_nt,) for alpha in recursive] + [()]
+
+    new_grammar = {}
+    for nt in grammar:
+        new_grammar[nt] = [join_symbols(p) for p in rules[nt]]
+        if nt in primes:
+            new_grammar[primes[nt]] = [join_symbols(p) for p in rules[primes[nt]]]
+
+    if stats is not None:
+        stats.add('remove_left_recursion.substitutions', substitutions)
+        stats.add('remove_left_recursion.new_nonterminals', len(primes))
+        stats.add_time('remove_left_recursion', started)
     return new_grammar
 
 # --- Left Factoring ---
-def left_factor(grammar):
-    print("\n--- Left Factoring ---")
-    new_grammar = grammar.copy()
-    
-    for nt in list(new_grammar.keys()):
-        prods = new_grammar[nt]
-        prods.sort()
-        
-        # Check first two productions for common prefix
-        if len(prods) < 2: continue
-        
-        # Find Longest Common Prefix (LCP)
-        p1, p2 = prods[0], prods[1]
-        i = 0
-        while i < len(p1) and i < len(p2) and p1[i] == p2[i]:
-            i += 1
-        prefix = p1[:i]
-        
-        if prefix:
-            print(f"Factoring {nt} with prefix '{prefix}'")
-            new_nt = nt + "'"
-            suffixes = []
-            retained = []
-            
-            for p in prods:
-                if p.startswith(prefix):
-                    suffix = p[len(prefix):]
-                    suffixes.append(suffix if suffix else 'ε')
-                else:
-                    retained.append(p)
-            
-            new_grammar[nt] = [prefix + new_nt] + retained
-            new_grammar[new_nt] = suffixes
-            
+def left_factor(grammar, verbose=True, stats=None):
+    """
+    Left factors every non-terminal until no two alternatives share a prefix.
+    The alternatives of each non-terminal are loaded into a prefix trie
+    (nested dicts, with the key None marking the end of a production).
+    Each child of the root is followed down its non-branching chain: that
+    chain is the longest common prefix of the group, and the subtrie where
+    it branches becomes the body of a new non-terminal, which is queued and
+    factored the same way. Every trie node is visited once, so the whole
+    pass is linear in the number of production symbols.
+    The input grammar is not modified.
+    """
+    if verbose:
+        print("\n--- Left Factoring ---")
+    if stats is not None:
+        started = stats.clock()
+    nonterminals = set(grammar)
+    max_len = max(map(len, nonterminals), default=1)
+    taken = set(grammar)
+
+    # 1. One prefix trie per non-terminal
+    work = []
+    for nt, prods in grammar.items():
+        root = {}
+        for p in prods:
+            node = root
+            for sym in split_symbols(p, nonterminals, max_len):
+                child = node.get(sym)
+                if child is None:
+                    child = node[sym] = {}
+                node = child
+            node[None] = True
+        work.append((nt, root))
+
+    # 2. Factor each trie; new non-terminals are appended to the worklist
+    new_grammar = {}
+    for nt, root in work:
+        prods = []
+        for sym, node in root.items():
+            if sym is None:
+                prods.append(EPSILON)
+                continue
+
+            prefix = [sym]
+            while len(node) == 1 and None not in node:
+                (sym, node), = node.items()
+                prefix.append(sym)
+
+            if len(node) == 1:
+                # Only one production in this group
+                prods.append(''.join(prefix))
+            else:
+                new_nt = fresh_name(nt, taken)
+                if verbose:
+                    print(f"Factoring {nt} with prefix '{''.join(prefix)}'")
+                prods.append(''.join(prefix) + new_nt)
+                work.append((new_nt, node))
+        new_grammar[nt] = prods
+
+    if stats is not None:
+        stats.add('left_factor.new_nonterminals', len(work) - len(grammar))
+        stats.add_time('left_factor', started)
     return new_grammar
 
+# --- Benchmark ---
+
+def synthetic_grammar(n_alternatives, n_nonterminals=10, alphabet='abcd', max_length=8, seed=0):
+    """
+    Generates a grammar with heavily overlapping alternatives (for factoring)
+    and pairwise indirect left recursion:
+        N2k   -> N2k+1 a | ...
+        N2k+1 -> N2k c | N2k+1 d | ...
+    """
+    rng = random.Random(seed)
+    grammar = {}
+    per_nt = max(1, n_alternatives // n_nonterminals)
+    for k in range(n_nonterminals):
+        nt = f"N{k}"
+        prods = [''.join(rng.choice(alphabet) for _ in range(rng.randint(1, max_length)))
+                 for _ in range(per_nt)]
+        if k % 2 == 0 and k + 1 < n_nonterminals:
+            prods.append(f"N{k + 1}a")
+        elif k % 2 == 1:
+            prods.append(f"N{k - 1}c")
+            prods.append(f"N{k}d")
+        grammar[nt] = prods
+    return grammar
+
+
+def benchmark(sizes=(1_000, 10_000, 100_000)):
+    print(f"{'Alternatives':<14} {'Symbols':<10} {'Recursion (s)':<15} {'Factoring (s)':<15} {'Symbols/s'}")
+    print("-" * 70)
+    for n in sizes:
+        grammar = synthetic_grammar(n, n_nonterminals=max(2, n // 100))
+        symbols = sum(len(p) for prods in grammar.values() for p in prods)
+
+        t0 = time.perf_counter()
+        g_no_rec = remove_left_recursion(grammar, verbose=False)
+        t1 = time.perf_counter()
+        left_factor(g_no_rec, verbose=False)
+        t2 = time.perf_counter()
+
+        rate = symbols / (t2 - t0)
+        print(f"{n:<14} {symbols:<10} {t1 - t0:<15.4f} {t2 - t1:<15.4f} {rate:,.0f}")
+
 # --- Main Execution ---
 if __name__ == "__main__":
     # Grammar with Left Recursion: E -> E+T | T
     # Grammar with Left Factors: S -> iEtS | iEtSeS | a
-    
+
     grammar = {
         'E': ['E+T', 'T'],
         'S': ['iEtS', 'iEtSeS', 'a']
     }
-    
+
     print("Original Grammar:", grammar)
-    
+
     # 1. Remove Recursion
     g_no_rec = remove_left_recursion(grammar)
     print("After Recursion Removal:", g_no_rec)
-    
+
     # 2. Left Factor
     g_final = left_factor(g_no_rec)
-    print("Final Grammar:", g_final)
\ No newline at end of file
+    print("Final Grammar:", g_final)
+
+    # 3. Indirect Left Recursion: S -> Aa | b, A -> Ac | Sd | e
+    indirect = {
+        'S': ['Aa', 'b'],
+        'A': ['Ac', 'Sd', 'e']
+    }
+    print("\nOriginal Grammar:", indirect)
+    print("After Recursion Removal:", remove_left_recursion(indirect))
+
+    # Run with --bench to time the transformations on synthetic grammars
+    if "--bench" in sys.argv:
+        print()
+        benchmark()
@@ -0,0 +1,420 @@
+# Import split_symbols, the LL(1) table builder and Stats by file name
+import sys
+import os
+from collections import defaultdict
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from importlib import import_module
+transform_module = import_module('Elimination of Left Recursion & Left Factoring')
+split_symbols = transform_module.split_symbols
+predictive = import_module('Predictive Parsing Table')
+instrumentation = import_module('Performance Instrumentation')
+
+# Both epsilon spellings used in this project
+EPSILONS = {'ε', '#'}
+
+# --- Templates ---
+# Every production of the optimized grammar keeps a template: the subtree
+# of the ORIGINAL grammar it stands for. A template is a tuple
+# (symbol, [children]) whose children are either nested templates or
+# integers, which are holes filled by the children of the optimized node.
+#   unchanged production  A -> xB     ('A', [0, 1])
+#   collapsed unit chain  E -> i      ('E', [('T', [('F', [0])])])
+
+def instantiate(template, fill):
+    """Replaces the holes of a template with fill[i]."""
+    symbol, children = template
+    return (symbol, [fill[c] if isinstance(c, int) else instantiate(c, fill)
+                     for c in children])
+
+
+def _identity(nt, rhs):
+    return (nt, list(range(len(rhs))))
+
+
+def _load(grammar):
+    nonterminals = set(grammar)
+    rules = {}
+    for nt, prods in grammar.items():
+        rules[nt] = []
+        for p in prods:
+            rhs = () if p in EPSILONS else split_symbols(p, nonterminals)
+            rules[nt].append((rhs, _identity(nt, rhs)))
+    return rules
+
+
+def _add(prods, seen, rhs, template):
+    if rhs not in seen:
+        seen.add(rhs)
+        prods.append((rhs, template))
+
+# --- Pass 1: Epsilon Productions ---
+
+def eliminate_epsilon(rules, start):
+    # Nullable non-terminals, each with one witness tree deriving ε
+    witness = {}
+    while True:
+        updated = False
+        for nt, prods in rules.items():
+            if nt in witness:
+                continue
+            for rhs, template in prods:
+                if all(s in witness for s in rhs):
+                    witness[nt] = instantiate(template, [witness[s] for s in rhs])
+                    updated = True
+                    break
+        if not updated:
+            break
+
+    new_rules = {}
+    for nt, prods in rules.items():
+        new_prods, seen = [], set()
+        for rhs, template in prods:
+            nullable = [i for i, s in enumerate(rhs) if s in witness]
+            # Every combination of keeping/dropping the nullable symbols
+            for mask in range(1 << len(nullable)):
+                dropped = {nullable[k] for k in range(len(nullable)) if mask >> k & 1}
+                new_rhs, fill = [], []
+                for i, s in enumerate(rhs):
+                    if i in dropped:
+                        fill.append(witness[s])
+                    else:
+                        fill.append(len(new_rhs))
+                        new_rhs.append(s)
+                if new_rhs:
+                    _add(new_prods, seen, tuple(new_rhs), instantiate(template, fill))
+        # Only the start symbol may keep an ε-production
+        if nt == start and nt in witness:
+            _add(new_prods, seen, (), witness[nt])
+        new_rules[nt] = new_prods
+    return new_rules
+
+# --- Pass 2: Unit Productions ---
+
+def eliminate_unit(rules):
+    def is_unit(rhs):
+        return len(rhs) == 1 and rhs[0] in rules
+
+    new_rules = {}
+    for nt in rules:
+        new_prods, seen = [], set()
+        # Walk the unit graph from nt, remembering the unit templates used
+        chains = {nt: []}
+        queue = [nt]
+        for B in queue:
+            for rhs, template in rules[B]:
+                if is_unit(rhs):
+                    C = rhs[0]
+                    if C not in chains:
+                        chains[C] = chains[B] + [template]
+                        queue.append(C)
+                    continue
+                # A =>* B -> rhs collapses into A -> rhs
+                for unit_template in reversed(chains[B]):
+                    template = instantiate(unit_template, [template])
+                _add(new_prods, seen, rhs, template)
+        new_rules[nt] = new_prods
+    return new_rules
+
+# --- Pass 3: Useless Symbols ---
+
+def eliminate_useless(rules, start):
+    # 1. Productive: derives some terminal string
+    productive = set()
+    while True:
+        updated = False
+        for nt, prods in rules.items():
+            if nt not in productive and any(
+                    all(s in productive or s not in rules for s in rhs) for rhs, _ in prods):
+                productive.add(nt)
+                updated = True
+        if not updated:
+            break
+
+    def usable(rhs):
+        return all(s in productive or s not in rules for s in rhs)
+
+    # 2. Reachable from the start symbol through usable productions
+    reachable = {start}
+    queue = [start]
+    for nt in queue:
+        for rhs, _ in rules[nt]:
+            if usable(rhs):
+                for s in rhs:
+                    if s in rules and s not in reachable:
+                        reachable.add(s)
+                        queue.append(s)
+
+    return {nt: [(rhs, t) for rhs, t in prods if usable(rhs)]
+            for nt, prods in rules.items() if nt in reachable}
+
+# --- Reports ---
+
+def _first_sets(grammar):
+    """
+    FIRST sets by fixed-point iteration ('#' marks nullable). The recursive
+    compute_first of the Predictive experiment does not terminate on
+    left-recursive grammars, which the original grammar may well be.
+    """
+    first = defaultdict(set)
+    while True:
+        updated = False
+        for nt, prods in grammar.items():
+            for prod in prods:
+                found = set()
+                if prod == '#':
+                    found.add('#')
+                else:
+                    for sym in prod:
+                        f = first[sym] if sym in grammar else {sym}
+                        found.update(f - {'#'})
+                        if '#' not in f:
+                            break
+                    else:
+                        found.add('#')
+                if not first[nt].issuperset(found):
+                    first[nt].update(found)
+                    updated = True
+        if not updated:
+            return first
+
+
+def table_stats(rules, start):
+    """Filled entries and conflicts of the LL(1) table built by build_parsing_table."""
+    # Symbol tuples work as productions there; '#' is ε and the start symbol goes first
+    grammar = {nt: [rhs or '#' for rhs, _ in rules[nt]] for nt in [start, *rules] if nt in rules}
+    first = _first_sets(grammar)
+    follow = predictive.compute_follow(grammar, first)
+    stats = instrumentation.Stats()
+    predictive.build_parsing_table(grammar, first, follow, stats=stats)
+    return stats.counters['build_parsing_table.entries'], stats.counters['build_parsing_table.conflicts']
+
+
+def grammar_stats(rules, start, sample=None):
+    entries, conflicts = table_stats(rules, start)
+    stats = {
+        'nonterminals': len(rules),
+        'productions': sum(len(prods) for prods in rules.values()),
+        'symbols': sum(len(rhs) for prods in rules.values() for rhs, _ in prods),
+        'unit_productions': sum(1 for prods in rules.values() for rhs, _ in prods
+                                if len(rhs) == 1 and rhs[0] in rules),
+        'epsilon_productions': sum(1 for prods in rules.values() for rhs, _ in prods if not rhs),
+        'table_entries': entries,
+        # Cells claimed by more than one production: not LL(1)
+        'table_conflicts': conflicts,
+    }
+    if sample is not None:
+        tree = derive_tree(sample, rules)
+        stats['parse_steps'] = parse_steps(tree) if tree is not None else None
+    return stats
+
+
+def parse_steps(tree):
+    """Counts the expansions (top-down) or reductions (bottom-up) in a parse tree."""
+    steps = 0
+    stack = [tree]
+    while stack:
+        node = stack.pop()
+        if not isinstance(node, str):
+            steps += 1
+            stack.extend(node[1])
+    return steps
+
+
+def _match(template, node, fill):
+    """Matches a template against a subtree of the original grammar, filling its holes."""
+    symbol, children = template
+    if isinstance(node, str) or node[0] != symbol or len(node[1]) != len(children):
+        return False
+    for t, child in zip(children, node[1]):
+        if isinstance(t, int):
+            fill[t] = child
+        elif not _match(t, child, fill):
+            return False
+    return True
+
+
+def derive_tree(tree, rules):
+    """
+    The inverse of restore_tree: rewrites a parse tree of the original
+    grammar as a tree of `rules` (the grammar after some pass). Every
+    template is written in terms of the original grammar, so each node is
+    matched against the templates of its non-terminal's productions.
+    Returns None if the tree cannot be derived in `rules`.
+    """
+    symbol = tree[0]
+    for rhs, template in rules.get(symbol, []):
+        fill = [None] * len(rhs)
+        if not _match(template, tree, fill):
+            continue
+        children = []
+        for sym, sub in zip(rhs, fill):
+            if sym in rules:
+                child = None if isinstance(sub, str) or sub[0] != sym else derive_tree(sub, rules)
+            else:
+                child = sub if sub == sym else None
+            if child is None:
+                break
+            children.append(child)
+        else:
+            return (symbol, children)
+    return None
+
+# --- Main Logic ---
+
+def optimize_grammar(grammar, start=None, remove_epsilon=False, sample=None):
+    """
+    Runs the optimization pipeline: [ε-productions], unit productions,
+    useless symbols. `sample` is an optional parse tree of the original
+    grammar; the report then counts its parse steps after every pass.
+    Returns:
+      - new_grammar: dict { NonTerminal: [productions] }
+      - origins: dict { (NonTerminal, rhs): template } for restore_tree, where
+        rhs is the tuple of right-hand side symbols (() for ε), so it does
+        not depend on how the grammar spells ε
+      - report: list of (pass_name, stats) after each pass, including the
+        filled entries and conflicts of the LL(1) table
+    """
+    if start is None:
+        start = next(iter(grammar))
+    epsilon = '#' if any(p == '#' for prods in grammar.values() for p in prods) else 'ε'
+
+    rules = _load(grammar)
+    report = [('original', grammar_stats(rules, start, sample))]
+
+    if remove_epsilon:
+        rules = eliminate_epsilon(rules, start)
+        report.append(('epsilon', grammar_stats(rules, start, sample)))
+
+    rules = eliminate_unit(rules)
+    report.append(('unit', grammar_stats(rules, start, sample)))
+
+    rules = eliminate_useless(rules, start)
+    report.append(('useless', grammar_stats(rules, start, sample)))
+
+    new_grammar = {}
+    origins = {}
+    for nt, prods in rules.items():
+        new_grammar[nt] = []
+        for rhs, template in prods:
+            prod = ''.join(rhs) or epsilon
+            new_grammar[nt].append(prod)
+            origins[(nt, rhs)] = template
+    return new_grammar, origins, report
+
+
+def restore_tree(tree, origins):
+    """
+    Rebuilds a parse tree of the optimized grammar in terms of the original
+    grammar. Trees are (NonTerminal, [children]) tuples with terminals as
+    plain strings; an ε-production is a node with no children.
+    """
+    results = []
+    stack = [(tree, False)]
+    while stack:
+        node, done = stack.pop()
+        if isinstance(node, str):
+            results.append(node)
+            continue
+        symbol, children = node
+        if not done:
+            stack.append((node, True))
+            stack.extend((child, False) for child in reversed(children))
+            continue
+        restored = results[len(results) - len(children):]
+        del results[len(results) - len(children):]
+        rhs = tuple(c if isinstance(c, str) else c[0] for c in children)
+        results.append(instantiate(origins[(symbol, rhs)], restored))
+    return results[0]
+
+
+def print_report(report):
+    columns = {'nonterminals': 'NTs', 'productions': 'Prods', 'symbols': 'Symbols',
+               'unit_productions': 'Unit', 'epsilon_productions': 'Epsilon',
+               'table_entries': 'Entries', 'table_conflicts': 'Conflicts',
+               'parse_steps': 'Steps'}
+    columns = {c: h for c, h in columns.items() if c in report[0][1]}
+    print(f"{'Pass':<10}" + "".join(f"{h:<11}" for h in columns.values()))
+    print("-" * (10 + 11 * len(columns)))
+    previous = None
+    for name, stats in report:
+        cells = []
+        for c in columns:
+            value = stats[c]
+            text = "-" if value is None else str(value)
+            if previous and value is not None and previous[c] is not None:
+                text += f" ({value - previous[c]:+d})"
+            cells.append(f"{text:<11}")
+        print(f"{name:<10}" + "".join(cells))
+        previous = stats
+
+# --- Execution ---
+if __name__ == "__main__":
+    # Stratified expression grammar (E -> T -> F unit chain) with an
+    # unproductive symbol H and an unreachable symbol G
+    grammar = {
+        'E': ['E+T', 'T'],
+        'T': ['T*F', 'F'],
+        'F': ['(E)', 'i', 'H'],
+        'H': ['H+i'],
+        'G': ['i']
+    }
+    print(f"Grammar: {grammar}\n")
+
+    # Sample derivation of i+i*i, counted after every pass
+    sample = ('E', [('E', [('T', [('F', ['i'])])]), '+',
+                    ('T', [('T', [('F', ['i'])]), '*', ('F', ['i'])])])
+    optimized, origins, report = optimize_grammar(grammar, sample=sample)
+    print(f"Optimized: {optimized}\n")
+    print_report(report)
+
+    # Parse tree of i+i in the optimized grammar, mapped back to the original
+    tree = ('E', [('E', ['i']), '+', ('T', ['i'])])
+    original = restore_tree(tree, origins)
+    print(f"\nOptimized tree: {tree}")
+    print(f"Original tree:  {original}")
+
+    # Output of left recursion removal: E -> TE', E' -> +TE' | ε
+    grammar = {
+        'E': ["TE'"],
+        "E'": ["+TE'", 'ε'],
+        'T': ['i']
+    }
+    print(f"\nGrammar: {grammar}\n")
+    optimized, origins, report = optimize_grammar(grammar, remove_epsilon=True)
+    print(f"Optimized: {optimized}\n")
+    print_report(report)
+
+    tree = ('E', ['i'])
+    print(f"\nOptimized tree: {tree}")
+    print(f"Original tree:  {restore_tree(tree, origins)}")
+
+    # Expression grammar of the FIRST/FOLLOW and Predictive experiments ('#' is ε)
+    grammar = {
+        'E': ['TR'],
+        'R': ['+TR', '#'],
+        'T': ['FY'],
+        'Y': ['*FY', '#'],
+        'F': ['(E)', 'i']
+    }
+    print(f"\nGrammar: {grammar}\n")
+
+    # Sample derivation from the predictive parser: i+i*i
+    def arena_tree(node):
+        """Arena node -> (symbol, [children]) tuple; the '#' leaf of ε becomes no children."""
+        if not node.symbol.isupper():
+            return node.symbol
+        return (node.symbol, [arena_tree(c) for c in node.children if c.symbol != '#'])
+
+    first = predictive.compute_first(grammar)
+    table = predictive.build_parsing_table(grammar, first, predictive.compute_follow(grammar, first))
+    arena = predictive.ParseTreeArena()
+    predictive.predictive_parse("i+i*i", table, 'E', arena)
+    sample = arena_tree(arena.node(arena.root))
+
+    optimized, origins, report = optimize_grammar(grammar, remove_epsilon=True, sample=sample)
+    print(f"Optimized: {optimized}\n")
+    print_report(report)
+
+    tree = ('E', [('T', ['i']), ('R', ['+', ('T', ['i'])])])
+    print(f"\nOptimized tree: {tree}")
+    print(f"Original tree:  {restore_tree(tree, origins)}")
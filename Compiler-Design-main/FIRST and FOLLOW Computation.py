@@ -6,10 +6,15 @@ def is_terminal(symbol):
     """Checks if a symbol is a terminal (uppercase = Non-Terminal, else Terminal)"""
     return not symbol.isupper()
 
-def compute_first(grammar):
+def compute_first(grammar, stats=None):
+    if stats is not None:
+        started = stats.clock()
     first = {nt: set() for nt in grammar}
+    calls = 0
     
     def get_first(symbol):
+        nonlocal calls
+        calls += 1
         # 1. If terminal, FIRST(X) = {X}
         if is_terminal(symbol):
             return {symbol}
@@ -42,19 +47,26 @@ def compute_first(grammar):
     # Compute for all Non-Terminals
     for nt in grammar:
         get_first(nt)
-        
+
+    if stats is not None:
+        stats.add('compute_first.calls', calls)
+        stats.add_time('compute_first', started)
     return first
 
-def compute_follow(grammar, first):
+def compute_follow(grammar, first, stats=None):
+    if stats is not None:
+        started = stats.clock()
     follow = {nt: set() for nt in grammar}
     start_symbol = list(grammar.keys())[0]
     
     # Rule 1: FOLLOW(Start) = {$}
     follow[start_symbol].add('$')
+    passes = 0
     
     # Iterate until sets stabilize (Fixed-Point Iteration)
     while True:
         updated = False
+        passes += 1
         
         for nt, productions in grammar.items():
             for production in productions:
@@ -98,10 +110,15 @@ def compute_follow(grammar, first):
                         if not follow[symbol].issuperset(follow[nt]):
                             follow[symbol].update(follow[nt])
                             updated = True
-                            
+
+        if stats is not None:
+            stats.event('compute_follow.pass', number=passes, updated=updated)
         if not updated:
             break
-            
+
+    if stats is not None:
+        stats.add('compute_follow.passes', passes)
+        stats.add_time('compute_follow', started)
     return follow
 
 # --- Main Execution ---
@@ -8,69 +8,160 @@ class Token(NamedTuple):
     line: int
     column: int
 
-def tokenize(code: str) -> Iterable[Token]:
-    # 2. Define Token Specifications (Regex Patterns)
-    # The order matters! Specific patterns (keywords) must come before general ones (identifiers).
-    token_specification = [
-        ('NUMBER',   r'\d+'),             # Integer
-        ('ASSIGN',   r'='),               # Assignment operator
-        ('END',      r';'),               # Statement terminator
-        ('ID',       r'[A-Za-z_]\w*'),    # Identifiers (vars)
-        ('OP',       r'[+\-*/]'),         # Arithmetic operators
-        ('LPAREN',   r'\('),              # (
-        ('RPAREN',   r'\)'),              # )
-        ('NEWLINE',  r'\n'),              # Line endings
-        ('SKIP',     r'[ \t]+'),          # Skip over spaces and tabs
-        ('MISMATCH', r'.'),               # Any other character
-    ]
-
-    # Combine into a single regex pattern using named groups: (?P<NAME>...)
-    tok_regex = '|'.join('(?P<%s>%s)' % pair for pair in token_specification)
-    
+# 2. Define Token Specifications (Regex Patterns)
+# The order matters! Specific patterns (keywords) must come before general ones (identifiers).
+TOKEN_SPECIFICATION = [
+    ('NUMBER',   r'\d+'),             # Integer
+    ('ASSIGN',   r'='),               # Assignment operator
+    ('END',      r';'),               # Statement terminator
+    ('ID',       r'[A-Za-z_]\w*'),    # Identifiers (vars)
+    ('OP',       r'[+\-*/]'),         # Arithmetic operators
+    ('LPAREN',   r'\('),              # (
+    ('RPAREN',   r'\)'),              # )
+    ('NEWLINE',  r'\n'),              # Line endings
+    ('SKIP',     r'[ \t]+'),          # Skip over spaces and tabs
+    ('MISMATCH', r'.'),               # Any other character
+]
+
+# Combine into a single regex pattern using named groups: (?P<NAME>...)
+# Compiled once at import instead of on every call
+TOKEN_REGEX = re.compile('|'.join('(?P<%s>%s)' % pair for pair in TOKEN_SPECIFICATION))
+
+KEYWORDS = {'if', 'else', 'while', 'print'}
+
+def tokenize(code: str, stats=None) -> Iterable[Token]:
+    """
+    Yields the tokens of `code`. With `stats`, the counters and the timer
+    are published when the generator finishes, raises, or is closed early
+    (e.g. the consumer breaks out of its loop). The 'tokenize' timer only
+    counts time spent lexing: the clock stops at every yield and restarts
+    when the consumer asks for the next token.
+    """
     # 3. Iterate over the input string
     line_num = 1
     line_start = 0
+    count = 0
+    if stats is not None:
+        busy = 0.0
+        resumed = stats.clock()   # None while the consumer has control
     
-    # re.finditer finds all matches in the string
-    for mo in re.finditer(tok_regex, code):
-        kind = mo.lastgroup
-        value = mo.group()
-        column = mo.start() - line_start
+    try:
+        # finditer finds all matches in the string
+        for mo in TOKEN_REGEX.finditer(code):
+            kind = mo.lastgroup
+            value = mo.group()
+            column = mo.start() - line_start
         
-        if kind == 'NUMBER':
-            value = int(value) # Convert to integer
-        elif kind == 'ID':
-            # Check if the Identifier is actually a Keyword
-            keywords = {'if', 'else', 'while', 'print'}
-            if value in keywords:
-                kind = value.upper() # e.g., 'if' becomes token type 'IF'
-        elif kind == 'NEWLINE':
-            line_start = mo.end()
-            line_num += 1
-            continue
-        elif kind == 'SKIP':
-            continue
-        elif kind == 'MISMATCH':
-            raise RuntimeError(f'{value!r} unexpected on line {line_num}')
+            if kind == 'NUMBER':
+                value = int(value) # Convert to integer
+            elif kind == 'ID':
+                # Check if the Identifier is actually a Keyword
+                if value in KEYWORDS:
+                    kind = value.upper() # e.g., 'if' becomes token type 'IF'
+            elif kind == 'NEWLINE':
+                line_start = mo.end()
+                line_num += 1
+                continue
+            elif kind == 'SKIP':
+                continue
+            elif kind == 'MISMATCH':
+                raise RuntimeError(f'{value!r} unexpected on line {line_num}')
         
-        # Yield the token object
-        yield Token(kind, value, line_num, column)
+            # Yield the token object
+            token = Token(kind, value, line_num, column)
+            if stats is not None:
+                count += 1
+                busy += stats.clock() - resumed
+                resumed = None
+            yield token
+            if stats is not None:
+                resumed = stats.clock()
+    finally:
+        if stats is not None:
+            if resumed is not None:
+                busy += stats.clock() - resumed
+            stats.add('tokenize.tokens', count)
+            stats.add('tokenize.lines', line_num)
+            stats.add_seconds('tokenize', busy)
 
-# --- Testing the Lexer ---
+# 4. Incremental Lexer (input arriving in chunks, e.g. from a socket)
+
+# A match of these kinds that ends at the end of the buffer may continue in
+# the next chunk ("pri" + "nt", "12" + "34"), so it is held back until more
+# text arrives. Every other token is complete as soon as it is matched.
+EXTENDABLE = {'NUMBER', 'ID', 'SKIP'}
+
+class IncrementalLexer:
+    """
+    Produces the same tokens (and line:column positions) as tokenize, but
+    from text fed piece by piece: feed(chunk) returns the tokens completed
+    so far and close() returns the rest. Only the unfinished tail of the
+    input is kept. Unlike tokenize, a bad character does not raise: it is
+    returned as a MISMATCH token so the caller can report it and go on.
+    """
+
+    def __init__(self):
+        self.buffer = ""
+        self.offset = 0       # position of buffer[0] in the whole input
+        self.line_num = 1
+        self.line_start = 0   # position where the current line starts
 
-# Sample Source Code
-source_code = """
+    def feed(self, chunk):
+        self.buffer += chunk
+        return self._scan(final=False)
+
+    def close(self):
+        return self._scan(final=True)
+
+    def _scan(self, final):
+        buffer = self.buffer
+        offset = self.offset
+        line_num = self.line_num
+        line_start = self.line_start
+        tokens = []
+        consumed = 0
+
+        for mo in TOKEN_REGEX.finditer(buffer):
+            kind = mo.lastgroup
+            if not final and mo.end() == len(buffer) and kind in EXTENDABLE:
+                break
+            consumed = mo.end()
+            value = mo.group()
+
+            if kind == 'NUMBER':
+                value = int(value)
+            elif kind == 'ID':
+                if value in KEYWORDS:
+                    kind = value.upper()
+            elif kind == 'NEWLINE':
+                line_start = offset + consumed
+                line_num += 1
+                continue
+            elif kind == 'SKIP':
+                continue
+            tokens.append(Token(kind, value, line_num, offset + mo.start() - line_start))
+
+        self.buffer = buffer[consumed:]
+        self.offset = offset + consumed
+        self.line_num = line_num
+        self.line_start = line_start
+        return tokens
+
+# --- Testing the Lexer ---
+if __name__ == "__main__":
+    # Sample Source Code
+    source_code = """
 x = 10;
 if (x) {
     print x + 5;
 }
 """
 
-print(f"{'TYPE':<12} {'VALUE':<10} {'LOC':<10}")
-print("-" * 35)
+    print(f"{'TYPE':<12} {'VALUE':<10} {'LOC':<10}")
+    print("-" * 35)
 
-try:
-    for token in tokenize(source_code):
-        print(f"{token.type:<12} {str(token.value):<10} {token.line}:{token.column}")
-except RuntimeError as e:
-    print(f"Error: {e}")
\ No newline at end of file
+    try:
+        for token in tokenize(source_code):
+            print(f"{token.type:<12} {str(token.value):<10} {token.line}:{token.column}")
+    except RuntimeError as e:
+        print(f"Error: {e}")
\ No newline at end of file
@@ -0,0 +1,214 @@
+import time
+from array import array
+
+NIL = -1  # "no node" marker for first_child / next_sibling / token_index
+
+# --- Arena ---
+
+class ParseTreeArena:
+    """
+    Parse tree stored as parallel arrays (one slot per node):
+      symbol[n]        symbol id (see symbols / intern)
+      first_child[n]   first child node, or NIL
+      next_sibling[n]  next sibling node, or NIL
+      token_index[n]   index of the matched input token, or NIL
+    Each node costs four 32-bit ints, there is no per-node Python object,
+    and all traversals are iterative, so trees with tens of millions of
+    nodes fit in a few hundred MB and never hit the recursion limit.
+    """
+
+    def __init__(self, tokens=None):
+        self.symbol = array('i')
+        self.first_child = array('i')
+        self.next_sibling = array('i')
+        self.token_index = array('i')
+        self.symbols = []      # symbol id -> symbol
+        self.symbol_ids = {}   # symbol -> symbol id
+        self.tokens = tokens   # optional token list for NodeView.token
+        self.root = NIL        # set by the parsers on ACCEPT
+
+    def __len__(self):
+        return len(self.symbol)
+
+    def intern(self, symbol):
+        sid = self.symbol_ids.get(symbol)
+        if sid is None:
+            sid = self.symbol_ids[symbol] = len(self.symbols)
+            self.symbols.append(symbol)
+        return sid
+
+    def nbytes(self):
+        return sum(a.itemsize * len(a) for a in
+                   (self.symbol, self.first_child, self.next_sibling, self.token_index))
+
+    # --- Building ---
+
+    def add_leaf(self, symbol_id, token_index=NIL):
+        """Adds a childless node (a shifted token, or a root to expand later)."""
+        node = len(self.symbol)
+        self.symbol.append(symbol_id)
+        self.first_child.append(NIL)
+        self.next_sibling.append(NIL)
+        self.token_index.append(token_index)
+        return node
+
+    def add_children(self, parent, symbol_ids):
+        """
+        Top-down: expands parent into new, contiguous child nodes.
+        Returns the first child; child k is first + k.
+        """
+        first = len(self.symbol)
+        n = len(symbol_ids)
+        if not n:
+            return NIL
+        self.symbol.extend(symbol_ids)
+        self.first_child.extend([NIL] * n)
+        self.next_sibling.extend(range(first + 1, first + n + 1))
+        self.next_sibling[-1] = NIL
+        self.token_index.extend([NIL] * n)
+        self.first_child[parent] = first
+        return first
+
+    def add_parent(self, symbol_id, children):
+        """Bottom-up: creates a node over already built children (a reduction)."""
+        node = self.add_leaf(symbol_id)
+        if children:
+            next_sibling = self.next_sibling
+            for left, right in zip(children, children[1:]):
+                next_sibling[left] = right
+            next_sibling[children[-1]] = NIL
+            self.first_child[node] = children[0]
+        return node
+
+    # --- Access ---
+
+    def node(self, index):
+        return NodeView(self, index)
+
+    def children(self, node):
+        child = self.first_child[node]
+        next_sibling = self.next_sibling
+        while child != NIL:
+            yield child
+            child = next_sibling[child]
+
+    # --- Traversal (iterative, no recursion) ---
+
+    def preorder(self, root=None, depths=False):
+        """Yields node ids parent-first (or (node, depth) pairs if depths=True)."""
+        node = self.root if root is None else root
+        if node == NIL:
+            return
+        first_child, next_sibling = self.first_child, self.next_sibling
+        parents = []
+        while True:
+            yield (node, len(parents)) if depths else node
+            child = first_child[node]
+            if child != NIL:
+                parents.append(node)
+                node = child
+                continue
+            # Leaf: move to the next sibling, climbing up as needed
+            while parents:
+                sibling = next_sibling[node]
+                if sibling != NIL:
+                    node = sibling
+                    break
+                node = parents.pop()
+            else:
+                return
+
+    def postorder(self, root=None):
+        """Yields node ids children-first (the order of a bottom-up parse)."""
+        node = self.root if root is None else root
+        if node == NIL:
+            return
+        first_child, next_sibling = self.first_child, self.next_sibling
+        parents = []
+        while True:
+            # Descend to the leftmost leaf
+            while first_child[node] != NIL:
+                parents.append(node)
+                node = first_child[node]
+            yield node
+            # Move to the next sibling, finishing parents on the way up
+            while parents:
+                sibling = next_sibling[node]
+                if sibling != NIL:
+                    node = sibling
+                    break
+                node = parents.pop()
+                yield node
+            else:
+                return
+
+
+class NodeView:
+    """Lightweight view of one arena node, created on demand."""
+    __slots__ = ('arena', 'index')
+
+    def __init__(self, arena, index):
+        self.arena = arena
+        self.index = index
+
+    @property
+    def symbol(self):
+        return self.arena.symbols[self.arena.symbol[self.index]]
+
+    @property
+    def token_index(self):
+        return self.arena.token_index[self.index]
+
+    @property
+    def token(self):
+        i = self.arena.token_index[self.index]
+        if i == NIL or self.arena.tokens is None:
+            return None
+        return self.arena.tokens[i]
+
+    @property
+    def children(self):
+        return [NodeView(self.arena, c) for c in self.arena.children(self.index)]
+
+    def __repr__(self):
+        return f"Node({self.index}, {self.symbol!r})"
+
+# --- Helper to Visualize ---
+
+def print_tree(arena, root=None):
+    for node, depth in arena.preorder(root, depths=True):
+        print("  " * depth + arena.symbols[arena.symbol[node]])
+
+# --- Test ---
+if __name__ == "__main__":
+    # E -> E + T built bottom-up, then expanded top-down
+    arena = ParseTreeArena()
+    E, T, F, plus, i = (arena.intern(s) for s in ['E', 'T', 'F', '+', 'i'])
+
+    left = arena.add_parent(E, [arena.add_parent(T, [arena.add_parent(F, [arena.add_leaf(i, 0)])])])
+    right = arena.add_leaf(T)
+    f = arena.add_children(right, [F])
+    arena.add_children(f, [i])
+    arena.root = arena.add_parent(E, [left, arena.add_leaf(plus, 1), right])
+
+    print_tree(arena)
+    print("Pre-order: ", [arena.symbols[arena.symbol[n]] for n in arena.preorder()])
+    print("Post-order:", [arena.symbols[arena.symbol[n]] for n in arena.postorder()])
+    print("Root view: ", arena.node(arena.root).children)
+
+    # Scale: a left-deep chain E -> E + i, as built by a bottom-up parser
+    n = 1_000_000
+    arena = ParseTreeArena()
+    E, plus, i = (arena.intern(s) for s in ['E', '+', 'i'])
+    start = time.perf_counter()
+    node = arena.add_parent(E, [arena.add_leaf(i, 0)])
+    for k in range(1, n):
+        node = arena.add_parent(E, [node, arena.add_leaf(plus), arena.add_leaf(i, k)])
+    arena.root = node
+    built = time.perf_counter()
+    visited = sum(1 for _ in arena.postorder())
+    walked = time.perf_counter()
+
+    print(f"\nNodes: {len(arena):,}  Depth: {n:,}")
+    print(f"Memory: {arena.nbytes() / len(arena):.0f} bytes/node ({arena.nbytes() / 2**20:.1f} MB)")
+    print(f"Build: {built - start:.2f}s  Post-order walk of {visited:,} nodes: {walked - built:.2f}s")
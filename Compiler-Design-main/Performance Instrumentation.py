@@ -0,0 +1,115 @@
+import time
+from collections import defaultdict
+
+# --- Stats Object ---
+# Every instrumented function takes an optional `stats` argument. With
+# stats=None (the default) the only cost is an `is not None` check at the
+# start and end of the call; hot loops keep plain local counters that are
+# published once the call finishes. Any object with the same five methods
+# (add, clock, add_time, add_seconds, event) can be passed instead of Stats.
+#
+# Counters and timers are named "<function>.<what>", e.g.
+#   nfa_to_dfa.closure_calls, compute_follow.passes, shift_reduce.shifts
+
+class Stats:
+    def __init__(self, hook=None):
+        self.counters = defaultdict(int)
+        self.timers = defaultdict(float)   # name -> total seconds
+        self.calls = defaultdict(int)      # name -> number of timed calls
+        self.hook = hook                   # hook(event_name, data_dict)
+
+    def add(self, name, n=1):
+        self.counters[name] += n
+
+    def clock(self):
+        return time.perf_counter()
+
+    def add_time(self, name, started):
+        self.add_seconds(name, time.perf_counter() - started)
+
+    def add_seconds(self, name, elapsed):
+        """Records one timed call measured by the caller (e.g. a generator's busy time)."""
+        self.timers[name] += elapsed
+        self.calls[name] += 1
+        if self.hook is not None:
+            self.hook(name, {'seconds': elapsed})
+
+    def event(self, name, **data):
+        """Forwards a fine-grained event (e.g. one fixed-point pass) to the hook."""
+        if self.hook is not None:
+            self.hook(name, data)
+
+    def reset(self):
+        self.counters.clear()
+        self.timers.clear()
+        self.calls.clear()
+
+    def as_dict(self):
+        return {
+            'counters': dict(self.counters),
+            'timers': {name: {'seconds': self.timers[name], 'calls': self.calls[name]}
+                       for name in self.timers},
+        }
+
+    def report(self):
+        lines = [f"{'Timer':<40} {'Calls':>8} {'Total (ms)':>12}", "-" * 62]
+        for name in sorted(self.timers):
+            lines.append(f"{name:<40} {self.calls[name]:>8} {self.timers[name] * 1000:>12.3f}")
+        lines += ["", f"{'Counter':<40} {'Value':>12}", "-" * 53]
+        for name in sorted(self.counters):
+            lines.append(f"{name:<40} {self.counters[name]:>12}")
+        return "\n".join(lines)
+
+# --- Profiling Hooks ---
+
+def print_hook(name, data):
+    """Hook that prints every event as it happens."""
+    details = " ".join(f"{k}={v}" for k, v in data.items())
+    print(f"[{name}] {details}")
+
+
+class SlowCallHook:
+    """Hook that records timed calls slower than `threshold` seconds."""
+
+    def __init__(self, threshold=0.1):
+        self.threshold = threshold
+        self.slow = []
+
+    def __call__(self, name, data):
+        seconds = data.get('seconds')
+        if seconds is not None and seconds >= self.threshold:
+            self.slow.append((name, seconds))
+
+# --- Test ---
+if __name__ == "__main__":
+    import os
+    import sys
+    sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+    from importlib import import_module
+    regex_nfa = import_module('Conversion from Regular Expression to NFA')
+    nfa_dfa = import_module('Conversion from NFA to DFA')
+    predictive = import_module('Predictive Parsing Table')
+    leading_trailing = import_module('Computation of LEADING and TRAILING')
+    shift_reduce = import_module('Shift Reduce Parsing')
+
+    stats = Stats(hook=print_hook)
+
+    # NFA -> DFA for (a|b)*abb
+    nfa = regex_nfa.regex_to_nfa("ab|*a.b.b.", stats=stats)
+    nfa_dfa.nfa_to_dfa(nfa, ['a', 'b'], stats=stats)
+
+    # FIRST/FOLLOW and the LL(1) table
+    first = predictive.compute_first(predictive.grammar, stats=stats)
+    follow = predictive.compute_follow(predictive.grammar, first, stats=stats)
+    table = predictive.build_parsing_table(predictive.grammar, first, follow, stats=stats)
+    predictive.predictive_parse("i+i*(i+i)", table, 'E', stats=stats)
+
+    # LEADING/TRAILING
+    leading_trailing.compute_leading(leading_trailing.grammar, stats=stats)
+    leading_trailing.compute_trailing(leading_trailing.grammar, stats=stats)
+
+    # Shift-Reduce
+    shift_reduce.shift_reduce_parser("id+id*id", stats=stats)
+
+    print()
+    print(stats.report())
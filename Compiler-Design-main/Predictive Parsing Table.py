@@ -1,4 +1,12 @@
 from collections import defaultdict
+# Import the parse tree arena from the Parse Tree Arena file
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from importlib import import_module
+arena_module = import_module('Parse Tree Arena')
+ParseTreeArena = arena_module.ParseTreeArena
+NIL = arena_module.NIL
 
 # --- 1. Define the Grammar ---
 # Rules: 
@@ -16,10 +24,15 @@ grammar = {
 
 # --- 2. Helper Functions (FIRST & FOLLOW) ---
 
-def compute_first(grammar):
+def compute_first(grammar, stats=None):
+    if stats is not None:
+        started = stats.clock()
     first = defaultdict(set)
+    calls = 0
     
     def get_first(symbol):
+        nonlocal calls
+        calls += 1
         # If terminal, FIRST is the symbol itself
         if not symbol.isupper():
             return {symbol}
@@ -50,15 +63,22 @@ def compute_first(grammar):
 
     for nt in grammar:
         get_first(nt)
+    if stats is not None:
+        stats.add('compute_first.calls', calls)
+        stats.add_time('compute_first', started)
     return first
 
-def compute_follow(grammar, first):
+def compute_follow(grammar, first, stats=None):
+    if stats is not None:
+        started = stats.clock()
     follow = defaultdict(set)
     start_symbol = list(grammar.keys())[0]
     follow[start_symbol].add('$') # Rule 1
+    passes = 0
     
     while True:
         updated = False
+        passes += 1
         for nt, productions in grammar.items():
             for production in productions:
                 # Scan: A -> alpha B beta
@@ -96,14 +116,22 @@ def compute_follow(grammar, first):
                         if not follow[symbol].issuperset(trailer):
                             follow[symbol].update(trailer)
                             updated = True
+        if stats is not None:
+            stats.event('compute_follow.pass', number=passes, updated=updated)
         if not updated: break
+    if stats is not None:
+        stats.add('compute_follow.passes', passes)
+        stats.add_time('compute_follow', started)
     return follow
 
 # --- 3. Main Logic: Construct Table ---
 
-def build_parsing_table(grammar, first, follow):
+def build_parsing_table(grammar, first, follow, stats=None):
+    if stats is not None:
+        started = stats.clock()
     # Table structure: { NonTerminal: { Terminal: Production } }
     table = defaultdict(dict)
+    conflicts = 0
     
     for nt, productions in grammar.items():
         for production in productions:
@@ -123,16 +151,141 @@ def build_parsing_table(grammar, first, follow):
             # Rule 1: For each terminal 'a' in FIRST(alpha), add A->alpha to Table
             for term in first_alpha:
                 if term != '#':
+                    conflicts += table[nt].get(term, production) != production
                     table[nt][term] = production
             
             # Rule 2: If ε in FIRST(alpha), add A->alpha to Table for each 'b' in FOLLOW(A)
             if '#' in first_alpha:
                 for term in follow[nt]:
+                    conflicts += table[nt].get(term, production) != production
                     table[nt][term] = production
 
+    if stats is not None:
+        # Conflicts are cells overwritten by another production (not LL(1))
+        stats.add('build_parsing_table.entries', sum(len(row) for row in table.values()))
+        stats.add('build_parsing_table.conflicts', conflicts)
+        stats.add_time('build_parsing_table', started)
     return table
 
-# --- 4. Display ---
+# --- 4. Table-Driven Parsing ---
+
+def predictive_parse(tokens, table, start, arena=None, stats=None):
+    """
+    Non-recursive LL(1) parser driven by the predictive parsing table.
+    tokens: sequence of terminals (e.g. "i+i*i").
+    If an arena is given, the parse tree is built into it and arena.root
+    is set on success. Returns True (ACCEPT) or False (REJECT).
+    """
+    if stats is not None:
+        started = stats.clock()
+    buffer = list(tokens) + ['$']
+    pos = 0
+    expansions = 0
+
+    def done(accepted):
+        if stats is not None:
+            stats.add('predictive_parse.matches', pos)
+            stats.add('predictive_parse.expansions', expansions)
+            stats.add('predictive_parse.accepted' if accepted else 'predictive_parse.rejected')
+            stats.add_time('predictive_parse', started)
+        return accepted
+
+    root = NIL
+    if arena is not None:
+        # Symbol ids of every production, interned once per parse
+        production_ids = {production: [arena.intern(char) for char in production]
+                          for row in table.values() for production in row.values()}
+        root = arena.add_leaf(arena.intern(start))
+
+    # Stack entries: (symbol, parse tree node)
+    stack = [('$', NIL), (start, root)]
+
+    while True:
+        X, node = stack.pop()
+        a = buffer[pos]
+
+        if X == '$':
+            if a != '$':
+                return done(False)
+            if arena is not None:
+                arena.root = root
+            return done(True)
+
+        # Terminal on top: must match the input
+        if not X.isupper():
+            if X != a:
+                return done(False)
+            if arena is not None:
+                arena.token_index[node] = pos
+            pos += 1
+            continue
+
+        # Non-terminal on top: expand with M[X, a]
+        production = table.get(X, {}).get(a)
+        if production is None:
+            return done(False)
+        expansions += 1
+
+        if arena is not None:
+            first = arena.add_children(node, production_ids[production])
+        if production == '#':
+            continue  # ε: nothing to push (the tree keeps an ε leaf)
+
+        for k in range(len(production) - 1, -1, -1):
+            stack.append((production[k], first + k if arena is not None else NIL))
+
+
+class PushParser:
+    """
+    The same LL(1) parser, driven from the outside: instead of reading a
+    token list, it is handed one terminal at a time with push(), so input
+    can be parsed while it is still arriving. Only the parser stack is kept
+    per instance; the (read-only) table can be shared by many parsers.
+    """
+
+    def __init__(self, table, start):
+        self.table = table
+        self.start = start
+        self.reset()
+
+    def reset(self):
+        self.stack = ['$', self.start]
+        self.expected = None
+
+    def push(self, a):
+        """
+        Feeds one terminal ('$' ends the input). Returns None while more
+        input is needed, True on ACCEPT and False on REJECT; after a REJECT,
+        self.expected lists the terminals that would have been valid.
+        """
+        stack = self.stack
+        while True:
+            X = stack[-1]
+
+            if X == '$':
+                if a == '$':
+                    return True
+                self.expected = ['$']
+                return False
+
+            # Terminal on top: must match the input
+            if not X.isupper():
+                if X != a:
+                    self.expected = [X]
+                    return False
+                stack.pop()
+                return None
+
+            # Non-terminal on top: expand with M[X, a] and look again
+            production = self.table.get(X, {}).get(a)
+            if production is None:
+                self.expected = sorted(self.table.get(X, {}))
+                return False
+            stack.pop()
+            if production != '#':
+                stack.extend(reversed(production))
+
+# --- 5. Display ---
 
 def print_table(table):
     # Get all terminals
@@ -170,4 +323,12 @@ if __name__ == "__main__":
     parsing_table = build_parsing_table(grammar, first_sets, follow_sets)
     
     # Output
-    print_table(parsing_table)
\ No newline at end of file
+    print_table(parsing_table)
+
+    # Parse an input and show its parse tree
+    user_input = "i+i*i"
+    arena = ParseTreeArena(tokens=user_input)
+    accepted = predictive_parse(user_input, parsing_table, 'E', arena)
+    print(f"\nParsing Input: {user_input} -> {'ACCEPT' if accepted else 'REJECT'}\n")
+    if accepted:
+        arena_module.print_tree(arena)
\ No newline at end of file
@@ -1,7 +1,21 @@
+# Import tokenize from the Lexical Analyzer file and the shared symbol
+# splitter from the Left Recursion & Left Factoring file
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from importlib import import_module
+lexer_module = import_module('Implementation of Lexical Analyzer')
+tokenize = lexer_module.tokenize
+split_symbols = import_module('Elimination of Left Recursion & Left Factoring').split_symbols
+arena_module = import_module('Parse Tree Arena')
+ParseTreeArena = arena_module.ParseTreeArena
+sinks_module = import_module('Trace Sinks')
+
 # --- Grammar Definition ---
 # format: (LHS, RHS)
 # Note: Order matters for conflict resolution in this simple parser!
-# We put longer rules first to prefer "longest match" (greedy reduction).
+# When several right-hand sides match the top of the stack, the rule
+# listed first wins.
 GRAMMAR = [
     ("E", "E+E"),
     ("E", "E*E"),
@@ -9,74 +23,212 @@ GRAMMAR = [
     ("E", "id")
 ]
 
-def shift_reduce_parser(input_string):
+# Multi-character terminals of the grammar (every other character is one symbol)
+TERMINALS = {'id'}
+
+# --- Helper Functions ---
+
+def token_symbol(token):
+    """Maps a lexer Token to a grammar terminal: identifiers and numbers are 'id'."""
+    if token.type in ('ID', 'NUMBER'):
+        return 'id'
+    return str(token.value)
+
+# --- Handle Recognition (Aho-Corasick) ---
+
+class HandleAutomaton:
+    """
+    Aho-Corasick automaton over the right-hand sides of a grammar.
+    Running it over the stack from bottom to top, the state reached after
+    the top symbol tells which right-hand sides are suffixes of the stack.
+    The parser keeps one state per stack entry, so after every shift or
+    reduction the handle is found with a single table lookup.
+    """
+
+    def __init__(self, grammar, terminals=()):
+        nonterminals = {lhs for lhs, _ in grammar}
+        self.symbols = []      # symbol id -> symbol
+        self.symbol_ids = {}   # symbol -> symbol id
+        self.rules = [(self.symbol_id(lhs),
+                       tuple(self.symbol_id(s) for s in split_symbols(rhs, nonterminals, terminals=terminals)))
+                      for lhs, rhs in grammar]
+
+        # 1. Trie of right-hand sides; own[state] = first rule ending there
+        trie = [{}]
+        own = [-1]
+        for index, (_, rhs) in enumerate(self.rules):
+            state = 0
+            for sid in rhs:
+                if sid not in trie[state]:
+                    trie.append({})
+                    own.append(-1)
+                    trie[state][sid] = len(trie) - 1
+                state = trie[state][sid]
+            if own[state] == -1:
+                own[state] = index
+
+        # 2. Failure links (BFS), folded into a full transition table
+        #    delta[state][symbol] and the best handle of every state
+        self.delta = [None] * len(trie)
+        self.handle = [-1] * len(trie)
+        fail = [0] * len(trie)
+        self.delta[0] = dict(trie[0])
+        queue = [0]
+        for state in queue:
+            for sid, child in trie[state].items():
+                fail[child] = self.delta[fail[state]].get(sid, 0) if state else 0
+                self.delta[child] = {**self.delta[fail[child]], **trie[child]}
+                inherited = self.handle[fail[child]]
+                if own[child] == -1 or (inherited != -1 and inherited < own[child]):
+                    self.handle[child] = inherited
+                else:
+                    self.handle[child] = own[child]
+                queue.append(child)
+
+    def symbol_id(self, symbol):
+        """Interns a grammar symbol while the automaton is built."""
+        sid = self.symbol_ids.get(symbol)
+        if sid is None:
+            sid = self.symbol_ids[symbol] = len(self.symbols)
+            self.symbols.append(symbol)
+        return sid
+
+
+HANDLE_AUTOMATON = HandleAutomaton(GRAMMAR, TERMINALS)
+
+# Symbol id of input terminals that the grammar does not know
+UNKNOWN = -1
+
+# Trace records: {'step', 'depth', 'pos', 'stack', 'input', 'action'}
+# 'depth' is the stack size and 'pos' the number of tokens shifted so far.
+# 'stack' and 'input' show at most TRACE_WINDOW symbols next to the parse
+# point ('…' marks the rest), so each record costs the same on any input.
+TRACE_WINDOW = 12
+TRACE_COLUMNS = [('step', 'Step', 5), ('stack', 'Stack', 15), ('input', 'Input', 15), ('action', 'Action', 0)]
+
+# --- Main Logic ---
+
+def shift_reduce_parser(input_string, automaton=HANDLE_AUTOMATON, arena=None, stats=None, trace=None):
+    """
+    Parses input_string bottom-up. If an arena is given, the parse tree is
+    built into it and arena.root is set on success. If a trace sink is
+    given, one record per step is emitted to it (see TRACE_COLUMNS).
+    Returns True (ACCEPT) or False (REJECT). Input that the lexer cannot
+    tokenize (e.g. '@') is not rejected but raises RuntimeError from
+    tokenize.
+    """
+    if stats is not None:
+        started = stats.clock()
+
     # 1. Initialization
-    stack = ""
-    input_buffer = input_string
+    # Terminals the grammar does not know (e.g. '=' or ';') become UNKNOWN;
+    # the shared automaton is never modified
+    terminals = [token_symbol(t) for t in tokenize(input_string)]
+    symbol_ids = automaton.symbol_ids
+    tokens = [symbol_ids.get(t, UNKNOWN) for t in terminals]
+    names = automaton.symbols
+    delta, handle, rules = automaton.delta, automaton.handle, automaton.rules
+    start = rules[0][0]
+
+    stack = []       # symbol ids
+    states = [0]     # automaton state below/after each stack entry
+    if arena is not None:
+        nodes = []   # parse tree node of each stack entry
+        arena_ids = [arena.intern(name) for name in names]
+    pos = 0
     step = 1
-    
-    print(f"{'Step':<5} {'Stack':<15} {'Input':<15} {'Action'}")
-    print("-" * 50)
-    
+
+    def done(accepted):
+        if stats is not None:
+            # Every step is one shift or one reduction, each preceded by
+            # one handle lookup; a rejected parse does one more lookup
+            reductions = step - 1 - pos
+            stats.add('shift_reduce.tokens', len(tokens))
+            stats.add('shift_reduce.shifts', pos)
+            stats.add('shift_reduce.reductions', reductions)
+            stats.add('shift_reduce.handle_lookups', pos + reductions + (not accepted))
+            stats.add('shift_reduce.accepted' if accepted else 'shift_reduce.rejected')
+            stats.add_time('shift_reduce', started)
+        if trace is not None:
+            trace.flush()
+        return accepted
+
+    def show(action):
+        top = "".join(names[s] for s in stack[-TRACE_WINDOW:])
+        ahead = "".join(terminals[pos:pos + TRACE_WINDOW])
+        trace.emit({
+            'step': step,
+            'depth': len(stack),
+            'pos': pos,
+            'stack': "…" + top if len(stack) > TRACE_WINDOW else top,
+            'input': ahead + "…" if len(terminals) - pos > TRACE_WINDOW else ahead,
+            'action': action,
+        })
+
     while True:
-        # Check if we reached the goal (Stack = Start Symbol 'E' and Input is empty)
-        if stack == "E" and input_buffer == "":
-            print(f"{step:<5} {stack:<15} {input_buffer:<15} ACCEPT")
-            break
-            
+        # Check if we reached the goal (Stack = Start Symbol and Input is empty)
+        if len(stack) == 1 and stack[0] == start and pos == len(tokens):
+            if trace is not None:
+                show("ACCEPT")
+            if arena is not None:
+                arena.root = nodes[0]
+            return done(True)
+
         # --- Reduction Phase ---
-        # Try to match the top of the stack with a RHS from the grammar
-        reduced = False
-        for lhs, rhs in GRAMMAR:
-            # Check if stack ends with this RHS
-            if stack.endswith(rhs):
-                # Found a handle! Reduce it.
-                
-                # Special Case: Don't reduce 'id' to 'E' immediately if we just shifted it?
-                # Actually, in simple Shift-Reduce, we reduce whenever possible.
-                
-                # However, to handle precedence (e.g. id+id*id), a simple parser
-                # without lookahead will struggle. 
-                # For this lab, we use a standard "reduce if handle found" logic.
-                
-                # Perform reduction: remove RHS, add LHS
-                stack = stack[:-len(rhs)] + lhs
-                print(f"{step:<5} {stack:<15} {input_buffer:<15} Reduce {lhs}->{rhs}")
-                step += 1
-                reduced = True
-                break # Restart loop to check for further reductions
-        
-        if reduced:
+        # The state on top of the stack already knows the handle (if any)
+        rule = handle[states[-1]]
+        if rule != -1:
+            lhs, rhs = rules[rule]
+            # Perform reduction: remove RHS, add LHS
+            del stack[-len(rhs):]
+            del states[-len(rhs):]
+            stack.append(lhs)
+            states.append(delta[states[-1]].get(lhs, 0))
+            if arena is not None:
+                children = nodes[-len(rhs):]
+                del nodes[-len(rhs):]
+                nodes.append(arena.add_parent(arena_ids[lhs], children))
+            if trace is not None:
+                show(f"Reduce {names[lhs]}->{''.join(names[s] for s in rhs)}")
+            step += 1
             continue
 
         # --- Shift Phase ---
         # If no reduction was possible, try to shift
-        if input_buffer:
-            # Shift the next character (or token)
-            # Here we assume 'id' is 2 chars, others are 1 char.
-            
-            if input_buffer.startswith("id"):
-                token = "id"
-                input_buffer = input_buffer[2:]
-            else:
-                token = input_buffer[0]
-                input_buffer = input_buffer[1:]
-                
-            stack += token
-            print(f"{step:<5} {stack:<15} {input_buffer:<15} Shift")
+        if pos < len(tokens):
+            sid = tokens[pos]
+            if sid == UNKNOWN:
+                if trace is not None:
+                    show(f"REJECT (unexpected {terminals[pos]!r})")
+                return done(False)
+            pos += 1
+            stack.append(sid)
+            states.append(delta[states[-1]].get(sid, 0))
+            if arena is not None:
+                nodes.append(arena.add_leaf(arena_ids[sid], pos - 1))
+            if trace is not None:
+                show("Shift")
             step += 1
         else:
             # No input left and no reductions possible -> Error
-            print(f"{step:<5} {stack:<15} {input_buffer:<15} REJECT (Error)")
-            break
+            if trace is not None:
+                show("REJECT (Error)")
+            return done(False)
 
 # --- Main Execution ---
 if __name__ == "__main__":
     # Input string to parse
     # Try: id+id*id
     user_input = "id+id*id"
-    
+
     print(f"Grammar:\n  E -> E+E\n  E -> E*E\n  E -> (E)\n  E -> id\n")
     print(f"Parsing Input: {user_input}\n")
-    
-    shift_reduce_parser(user_input)
\ No newline at end of file
+
+    try:
+        arena = ParseTreeArena()
+        trace = sinks_module.TableSink(TRACE_COLUMNS)
+        if shift_reduce_parser(user_input, arena=arena, trace=trace):
+            print("\nParse Tree:")
+            arena_module.print_tree(arena)
+    except RuntimeError as e:
+        print(f"Error: {e}")
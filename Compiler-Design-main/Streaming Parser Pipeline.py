@@ -0,0 +1,247 @@
+# Import the incremental lexer and the LL(1) push parser by file name
+import asyncio
+import codecs
+import os
+import sys
+from typing import NamedTuple
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from importlib import import_module
+lexer = import_module('Implementation of Lexical Analyzer')
+predictive = import_module('Predictive Parsing Table')
+
+# --- 1. Statement Grammar ---
+# The lexer's statements, as single-character terminals:
+#   i = identifier, n = number, p = 'print', '#' = epsilon
+# Each statement ends with ';', which the parser sees as '$'.
+
+STATEMENT_GRAMMAR = {
+    'S': ['i=E', 'pE'],
+    'E': ['TR'],
+    'R': ['+TR', '-TR', '#'],
+    'T': ['FY'],
+    'Y': ['*FY', '/FY', '#'],
+    'F': ['(E)', 'i', 'n'],
+}
+
+TOKEN_TERMINALS = {'ID': 'i', 'NUMBER': 'n', 'PRINT': 'p'}
+PUNCTUATION = {'ASSIGN', 'OP', 'LPAREN', 'RPAREN'}   # the token value is the terminal
+TERMINAL_NAMES = {'i': 'identifier', 'n': 'number', 'p': "'print'", '$': "';'"}
+
+
+class CompiledGrammar:
+    """
+    FIRST/FOLLOW sets and the LL(1) table, built once. Parsing never
+    modifies them, so one instance is shared by every stream.
+    """
+
+    def __init__(self, grammar=STATEMENT_GRAMMAR):
+        self.grammar = grammar
+        self.start = next(iter(grammar))
+        self.first = predictive.compute_first(grammar)
+        self.follow = predictive.compute_follow(grammar, self.first)
+        self.table = predictive.build_parsing_table(grammar, self.first, self.follow)
+
+    def parser(self):
+        return predictive.PushParser(self.table, self.start)
+
+
+class StatementResult(NamedTuple):
+    index: int      # statement number in its stream, from 1
+    line: int       # line where the statement starts
+    ok: bool
+    tokens: list    # tokens of the statement, without the ';'
+    error: str      # None when ok
+
+
+def _describe(terminals):
+    return ", ".join(TERMINAL_NAMES.get(t, repr(t)) for t in terminals)
+
+
+# --- 2. Statement Parser ---
+
+class StatementParser:
+    """
+    Splits a token stream at ';' and parses each statement with a push
+    parser. After a syntax error the rest of the statement is skipped
+    (panic mode, with ';' as the synchronizing token), so one bad statement
+    does not hide the errors or results of the ones after it.
+    """
+
+    def __init__(self, compiled):
+        self.parser = compiled.parser()
+        self.index = 0
+        self._next_statement()
+
+    def _next_statement(self):
+        self.parser.reset()
+        self.tokens = []
+        self.error = None
+
+    def _result(self, line):
+        self.index += 1
+        result = StatementResult(self.index, line, self.error is None, self.tokens, self.error)
+        self._next_statement()
+        return result
+
+    def push(self, token):
+        """Feeds one token; returns a StatementResult when a ';' ends a statement."""
+        if token.type == 'END':
+            line = self.tokens[0].line if self.tokens else token.line
+            if self.error is None and not self.parser.push('$'):
+                self.error = (f"unexpected ';' at {token.line}:{token.column}, "
+                              f"expected {_describe(self.parser.expected)}")
+            return self._result(line)
+
+        self.tokens.append(token)
+        if self.error is not None:
+            return None  # skipping to the next ';'
+
+        terminal = TOKEN_TERMINALS.get(token.type)
+        if terminal is None and token.type in PUNCTUATION:
+            terminal = token.value
+        if terminal is None:
+            self.error = f"unexpected {token.value!r} at {token.line}:{token.column}"
+        elif self.parser.push(terminal) is False:
+            self.error = (f"unexpected {token.value!r} at {token.line}:{token.column}, "
+                          f"expected {_describe(self.parser.expected)}")
+        return None
+
+    def finish(self):
+        """End of input: reports a last statement that is missing its ';'."""
+        if not self.tokens:
+            return None
+        if self.error is None:
+            last = self.tokens[-1]
+            self.error = f"missing ';' after {last.value!r} at {last.line}:{last.column}"
+        return self._result(self.tokens[0].line)
+
+
+# --- 3. Asyncio Pipeline ---
+
+async def parse_stream(chunks, compiled, max_pending=16):
+    """
+    Async generator: lexes and parses text from the async iterable `chunks`
+    and yields one StatementResult as soon as each statement is complete.
+
+    A producer task reads chunks and lexes them; the tokens of each chunk go
+    through a queue holding at most `max_pending` batches. When the parser
+    falls behind, the producer waits on the full queue and stops reading
+    from the source (backpressure). Errors raised by the source itself
+    (e.g. a dropped connection) are re-raised here.
+    """
+    queue = asyncio.Queue(maxsize=max_pending)
+    done = object()
+
+    async def produce():
+        incremental = lexer.IncrementalLexer()
+        try:
+            async for chunk in chunks:
+                tokens = incremental.feed(chunk)
+                if tokens:
+                    await queue.put(tokens)
+            await queue.put(incremental.close())
+            await queue.put(done)
+        except Exception as e:
+            await queue.put(e)
+
+    producer = asyncio.create_task(produce())
+    statements = StatementParser(compiled)
+    try:
+        while True:
+            batch = await queue.get()
+            if batch is done:
+                break
+            if isinstance(batch, Exception):
+                raise batch
+            for token in batch:
+                result = statements.push(token)
+                if result is not None:
+                    yield result
+        result = statements.finish()
+        if result is not None:
+            yield result
+    finally:
+        # Also stops the producer if the caller leaves early
+        producer.cancel()
+
+
+async def read_chunks(reader, chunk_size=4096, encoding="utf-8"):
+    """
+    Adapts an asyncio.StreamReader (bytes, e.g. from a socket) to text
+    chunks. The incremental decoder keeps multi-byte characters that are
+    split across reads intact.
+    """
+    decoder = codecs.getincrementaldecoder(encoding)()
+    while True:
+        data = await reader.read(chunk_size)
+        if not data:
+            break
+        text = decoder.decode(data)
+        if text:
+            yield text
+    tail = decoder.decode(b"", final=True)
+    if tail:
+        yield tail
+
+# --- Test ---
+if __name__ == "__main__":
+    import random
+    import time
+
+    async def chunked(text, rng, max_size=8):
+        """Simulated network source: random chunk sizes, yielding to the loop in between."""
+        i = 0
+        while i < len(text):
+            size = rng.randint(1, max_size)
+            yield text[i:i + size]
+            i += size
+            await asyncio.sleep(0)
+
+    def show(name, result):
+        status = "OK   " if result.ok else "ERROR"
+        text = " ".join(str(t.value) for t in result.tokens)
+        print(f"{name:<8} #{result.index:<3} line {result.line:<3} {status} {text}"
+              + (f"  <- {result.error}" if result.error else ""))
+
+    async def consume(name, chunks, compiled):
+        async for result in parse_stream(chunks, compiled):
+            show(name, result)
+
+    async def main():
+        compiled = CompiledGrammar()
+        rng = random.Random(0)
+
+        # 1. Concurrent streams on one event loop, sharing one table;
+        #    results interleave as each statement completes
+        sources = {
+            'good': "x = 10;\ny = x * (2 + z);\nprint y - 1;\n",
+            'errors': "x = = 1;\nprint (x;\ny = 3 $ 4;\nz = 5;\nprint z",
+            'keyword': "if = 1;\nwhile;\nw = w / 2;\n",
+        }
+        await asyncio.gather(*(consume(name, chunked(text, rng), compiled)
+                               for name, text in sources.items()))
+
+        # 2. Bytes from a StreamReader, with 'é' split across two reads
+        print()
+        reader = asyncio.StreamReader()
+        data = "café = 1;\nprint 2;\n".encode("utf-8")
+        reader.feed_data(data[:4])
+        reader.feed_data(data[4:])
+        reader.feed_eof()
+        await consume('reader', read_chunks(reader, chunk_size=3), compiled)
+
+        # 3. Throughput: many concurrent streams
+        n_streams, n_statements = 200, 500
+        statement = "total = total + price * (count - 1);\n"
+        start = time.perf_counter()
+        counts = await asyncio.gather(*(
+            count_ok(chunked(statement * n_statements, random.Random(k), max_size=4096), compiled)
+            for k in range(n_streams)))
+        elapsed = time.perf_counter() - start
+        print(f"\n{n_streams} streams, {sum(counts):,} statements in {elapsed:.2f}s "
+              f"- {sum(counts) / elapsed:,.0f} statements/s")
+
+    async def count_ok(chunks, compiled):
+        return sum([result.ok async for result in parse_stream(chunks, compiled)])
+
+    asyncio.run(main())
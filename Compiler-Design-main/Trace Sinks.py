@@ -0,0 +1,128 @@
+import json
+import sys
+from collections import deque
+
+# --- Trace Sinks ---
+# Engines that can trace (shift_reduce_parser, nfa_to_dfa, trace_nfa) take
+# an optional `trace` sink and call sink.emit(record) with one dict per
+# event, then sink.flush() when they finish. With trace=None no record is
+# ever built. Sinks that write buffer the records and write them in
+# batches, so tracing costs one write call per batch, not one per step.
+
+class RingBufferSink:
+    """Keeps only the last `capacity` records in memory (e.g. for post-mortems)."""
+
+    def __init__(self, capacity=1000):
+        self.buffer = deque(maxlen=capacity)
+
+    def emit(self, record):
+        self.buffer.append(record)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+    def records(self):
+        return list(self.buffer)
+
+
+class JSONLinesSink:
+    """Writes one JSON object per line to a file path or file object."""
+
+    def __init__(self, file, batch_size=1024):
+        self.owns_file = isinstance(file, str)
+        self.file = open(file, "w", encoding="utf-8") if self.owns_file else file
+        self.batch_size = batch_size
+        self.pending = []
+
+    def emit(self, record):
+        self.pending.append(record)
+        if len(self.pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if self.pending:
+            self.file.write("".join(json.dumps(r, ensure_ascii=False, default=str) + "\n"
+                                    for r in self.pending))
+            self.pending.clear()
+        self.file.flush()
+
+    def close(self):
+        self.flush()
+        if self.owns_file:
+            self.file.close()
+
+
+class TableSink:
+    """
+    Pretty-prints records as a fixed-width table.
+    columns: list of (key, heading, width); a width of 0 means no padding.
+    """
+
+    def __init__(self, columns, file=None, batch_size=256):
+        self.columns = columns
+        self.file = file if file is not None else sys.stdout
+        self.batch_size = batch_size
+        self.pending = []
+        self.header_written = False
+
+    def _row(self, values):
+        return " ".join(f"{str(v):<{w}}" if w else str(v)
+                        for v, (_, _, w) in zip(values, self.columns)).rstrip()
+
+    def emit(self, record):
+        self.pending.append(record)
+        if len(self.pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if not self.pending and self.header_written:
+            return
+        lines = []
+        if not self.header_written:
+            header = self._row([heading for _, heading, _ in self.columns])
+            lines += [header, "-" * max(len(header), 50)]
+            self.header_written = True
+        lines += [self._row([r.get(key, "") for key, _, _ in self.columns]) for r in self.pending]
+        self.pending.clear()
+        self.file.write("\n".join(lines) + "\n")
+        self.file.flush()
+
+    def close(self):
+        self.flush()
+
+# --- Test ---
+if __name__ == "__main__":
+    import io
+    import os
+    import time
+    sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+    from importlib import import_module
+    shift_reduce = import_module('Shift Reduce Parsing')
+
+    # 1. Table pretty-printer
+    user_input = "id+id*id"
+    print(f"Parsing Input: {user_input}\n")
+    shift_reduce.shift_reduce_parser(user_input, trace=TableSink(shift_reduce.TRACE_COLUMNS))
+
+    # 2. JSON lines
+    print()
+    out = io.StringIO()
+    shift_reduce.shift_reduce_parser("(id)", trace=JSONLinesSink(out))
+    print(out.getvalue(), end="")
+
+    # 3. Ring buffer: only the last steps of a long parse are kept
+    ring = RingBufferSink(capacity=3)
+    shift_reduce.shift_reduce_parser("+".join(["id"] * 1000), trace=ring)
+    print()
+    for record in ring.records():
+        print(record)
+
+    # 4. Throughput with and without tracing
+    long_input = "+".join(["id"] * 2000)
+    for label, sink in [("no trace", None), ("ring buffer", RingBufferSink())]:
+        start = time.perf_counter()
+        shift_reduce.shift_reduce_parser(long_input, trace=sink)
+        print(f"{label:<12} {time.perf_counter() - start:.4f}s")